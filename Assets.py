@@ -0,0 +1,77 @@
+from collections.abc import Callable
+from ctypes import addressof
+from pathlib import Path
+from typing import Any
+from sdl2 import *
+from sdl2.sdlimage import *
+from sdl2.sdlttf import *
+from useful import load_image_as_texture
+
+
+ASSETS_FOLDER = Path.cwd() / "assets"
+
+TEXTURE = "texture"
+SURFACE = "surface"
+FONT = "font"
+
+FREE: dict[str, Callable[[Any], None]] = {
+    TEXTURE: SDL_DestroyTexture,
+    SURFACE: SDL_FreeSurface,
+    FONT: TTF_CloseFont
+}
+
+
+class AssetCache:
+    def __init__(self) -> None:
+        self.entries: dict[tuple, list] = {}
+        self.keys: dict[int, tuple] = {}
+
+    def acquire(self, key: tuple, load: Callable[[], Any]) -> Any:
+        entry = self.entries.get(key)
+        if entry is None:
+            handle = load()
+            if not handle:
+                raise FileNotFoundError(f"Could not load {key[-1]}: {SDL_GetError().decode()}")
+            entry = [handle, 0]
+            self.entries[key] = entry
+            self.keys[addressof(handle.contents)] = key
+        entry[1] += 1
+        return entry[0]
+
+    def texture(self, renderer: SDL_Renderer, name: str) -> SDL_Texture:
+        path = str(ASSETS_FOLDER / name).encode()
+        return self.acquire((TEXTURE, name), lambda: load_image_as_texture(path, renderer))
+
+    def surface(self, name: str) -> SDL_Surface:
+        path = str(ASSETS_FOLDER / name).encode()
+        return self.acquire((SURFACE, name), lambda: IMG_Load(path))
+
+    def font(self, name: str, size: int) -> TTF_Font:
+        path = str(ASSETS_FOLDER / name).encode()
+        return self.acquire((FONT, size, name), lambda: TTF_OpenFont(path, size))
+
+    def release(self, handle: Any) -> None:
+        address = addressof(handle.contents)
+        key = self.keys[address]
+        entry = self.entries[key]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self.entries[key]
+            del self.keys[address]
+            FREE[key[0]](entry[0])
+
+    def loaded(self) -> int:
+        return len(self.entries)
+
+    def quit(self) -> None:
+        for key, (handle, _) in self.entries.items():
+            FREE[key[0]](handle)
+        self.entries.clear()
+        self.keys.clear()
+
+
+_assets = AssetCache()
+
+
+def assets() -> AssetCache:
+    return _assets
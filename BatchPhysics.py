@@ -0,0 +1,381 @@
+import numpy as np
+from CollisionGrid import CollisionGrid, SOLID, DEADLY, CELL_SIZE
+from RoomSpecials import RoomSpecials
+from SpecialObject import JUMP_PAD, JUMP_ORB, DASH_ORB, ROOM_FINISH, CHECKPOINT
+from Physics import *
+
+
+def _span(position: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    first = np.floor(position / CELL_SIZE).astype(np.int64)
+    last = np.ceil((position + PLAYER_SIZE) / CELL_SIZE).astype(np.int64) - 1
+    return first, last
+
+
+class BatchPhysics:
+    def __init__(self, walls: CollisionGrid, specials: RoomSpecials, count: int, full_jump_release: bool = True) -> None:
+        self.cells = np.frombuffer(bytes(walls.cells), dtype=np.uint8).reshape(walls.height, walls.width)
+        self.count = count
+        self.full_jump_release = full_jump_release
+        spawn = specials.spawn
+        self.spawn: tuple[int, int] = (specials.x[spawn], specials.y[spawn]) if spawn >= 0 else (0, 0)
+        self.jump_orbs = specials.boxes(JUMP_ORB)
+        self.dash_orbs = specials.boxes(DASH_ORB)
+        touchables = [
+            (specials.order[i], kind, column)
+            for kind in (JUMP_PAD, JUMP_ORB, DASH_ORB)
+            for column, i in enumerate(specials.indices(kind))
+        ]
+        touchables.sort()
+        self.touchable_kinds = [kind for _, kind, _ in touchables]
+        self.touchable_columns = [column for _, _, column in touchables]
+        self.touchables = np.array(
+            [(specials.left[i], specials.top[i], specials.right[i] - specials.left[i], specials.bottom[i] - specials.top[i])
+             for i in (specials.indices(kind)[column] for _, kind, column in touchables)],
+            dtype=np.float64
+        ).reshape(-1, 4)
+        self.room_finishes = specials.boxes(ROOM_FINISH)
+        self.checkpoints = specials.boxes(CHECKPOINT)
+        checkpoints = specials.indices(CHECKPOINT)
+        self.checkpoint_positions = np.array(
+            [(specials.x[i], specials.y[i]) for i in checkpoints], dtype=np.float64
+        ).reshape(-1, 2)
+        self.reset()
+
+    def reset(self) -> None:
+        n = self.count
+        self.tick = 0
+        self.x = np.full(n, float(self.spawn[0]))
+        self.y = np.full(n, float(self.spawn[1]))
+        self.momentum_x = np.zeros(n)
+        self.momentum_y = np.zeros(n)
+        self.dash_momentum = np.zeros(n)
+        self.dash_timer = np.zeros(n)
+        self.dash_timeout = np.zeros(n)
+        self.update_timeout = np.full(n, RESPAWN_TIMEOUT)
+        self.can_jump = np.zeros(n, dtype=bool)
+        self.can_dash = np.zeros(n, dtype=bool)
+        self.should_jump = np.zeros(n, dtype=bool)
+        self.should_dash = np.zeros(n, dtype=bool)
+        self.grabbing_wall = np.zeros(n, dtype=bool)
+        self.finished = np.zeros(n, dtype=bool)
+        self.finish_tick = np.full(n, -1, dtype=np.int64)
+        self.deaths = np.zeros(n, dtype=np.int64)
+        self.active_checkpoint = np.full(n, -1, dtype=np.int64)
+        self.jump_orb_timers = np.zeros((n, len(self.jump_orbs)))
+        self.dash_orb_timers = np.zeros((n, len(self.dash_orbs)))
+
+    def overlapping(self, boxes: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        x = self.x[idx, None]
+        y = self.y[idx, None]
+        return (
+            (boxes[:, 0] < x + PLAYER_SIZE) & (boxes[:, 0] + boxes[:, 2] > x)
+            & (boxes[:, 1] < y + PLAYER_SIZE) & (boxes[:, 1] + boxes[:, 3] > y)
+        )
+
+    def cells_are(self, rows: np.ndarray, columns: np.ndarray, kind: int) -> np.ndarray:
+        height, width = self.cells.shape
+        inside = (rows >= 0) & (rows < height) & (columns >= 0) & (columns < width)
+        found = self.cells[np.clip(rows, 0, height - 1), np.clip(columns, 0, width - 1)] == kind
+        return inside & found
+
+    def touching(self, idx: np.ndarray, kind: int) -> np.ndarray:
+        first_column, last_column = _span(self.x[idx])
+        first_row, last_row = _span(self.y[idx])
+        return (
+            self.cells_are(first_row, first_column, kind) | self.cells_are(first_row, last_column, kind)
+            | self.cells_are(last_row, first_column, kind) | self.cells_are(last_row, last_column, kind)
+        )
+
+    def solid(self, along: np.ndarray, across: np.ndarray, vertical: bool) -> np.ndarray:
+        if vertical:
+            return self.cells_are(along, across, SOLID)
+        return self.cells_are(across, along, SOLID)
+
+    def push_out(self, along: np.ndarray, wall: np.ndarray, push_negative: np.ndarray) -> np.ndarray:
+        return np.where(
+            push_negative,
+            along - np.ceil(along + PLAYER_SIZE - wall),
+            along + np.ceil(wall + CELL_SIZE - along)
+        )
+
+    def cell_offsets(self, along_count: int, across_count: int, vertical: bool) -> list[tuple[int, int]]:
+        if vertical:
+            return [(i, j) for j in range(across_count) for i in range(along_count)]
+        return [(i, j) for i in range(along_count) for j in range(across_count)]
+
+    def move_axis(self, along: np.ndarray, across: np.ndarray, distance: np.ndarray,
+                  push_negative: np.ndarray, vertical: bool) -> tuple[np.ndarray, np.ndarray]:
+        along_size, across_size = self.cells.shape if vertical else self.cells.shape[::-1]
+        moving = distance != 0
+        positive = distance > 0
+        divisor = np.where(moving, distance, 1.0)
+        top = np.minimum(along, along + distance)
+        along_first = np.maximum(np.floor(top / CELL_SIZE), 0).astype(np.int64)
+        along_stop = np.minimum(np.ceil((top + (PLAYER_SIZE + np.abs(distance))) / CELL_SIZE), along_size).astype(np.int64)
+        across_first = np.maximum(np.floor(across / CELL_SIZE), 0).astype(np.int64)
+        across_stop = np.minimum(np.ceil((across + PLAYER_SIZE) / CELL_SIZE), across_size).astype(np.int64)
+        across_low = across_first * CELL_SIZE
+        first_time = np.ones(len(along))
+        wall = np.zeros(len(along))
+        hit = np.zeros(len(along), dtype=bool)
+        along_count = int((along_stop - along_first).max(initial=0))
+        across_count = int((across_stop - across_first).max(initial=0))
+        for i, j in self.cell_offsets(along_count, across_count, vertical):
+            along_cell = along_first + i
+            across_cell = across_first + j
+            low = along_cell * float(CELL_SIZE)
+            side = across_low + j * CELL_SIZE
+            entry = np.maximum(np.where(positive, low - along - PLAYER_SIZE, low + CELL_SIZE - along) / divisor, 0.0)
+            leave = np.minimum(np.where(positive, low + CELL_SIZE - along, low - along - PLAYER_SIZE) / divisor, 1.0)
+            impact = (
+                moving & (along_cell < along_stop) & (across_cell < across_stop)
+                & self.solid(along_cell, across_cell, vertical)
+                & (side < across + PLAYER_SIZE) & (side + CELL_SIZE > across)
+                & ~((low < along + PLAYER_SIZE) & (low + CELL_SIZE > along))
+                & (entry < leave) & (entry < first_time)
+            )
+            first_time = np.where(impact, entry, first_time)
+            wall = np.where(impact, low, wall)
+            hit |= impact
+        along = along + distance
+        along = np.where(hit, self.push_out(along, wall, push_negative), along)
+        along_first = np.maximum(np.floor(along / CELL_SIZE) - 1, 0).astype(np.int64)
+        along_stop = np.minimum(np.ceil((along + PLAYER_SIZE) / CELL_SIZE) + 1, along_size).astype(np.int64)
+        across_first = np.maximum(np.floor(across / CELL_SIZE) - 1, 0).astype(np.int64)
+        across_stop = np.minimum(np.ceil((across + PLAYER_SIZE) / CELL_SIZE) + 1, across_size).astype(np.int64)
+        colliding = hit.copy()
+        along_count = int((along_stop - along_first).max(initial=0))
+        across_count = int((across_stop - across_first).max(initial=0))
+        for i, j in self.cell_offsets(along_count, across_count, vertical):
+            along_cell = along_first + i
+            across_cell = across_first + j
+            low = along_cell * float(CELL_SIZE)
+            side = across_cell * float(CELL_SIZE)
+            overlapping = (
+                (along_cell < along_stop) & (across_cell < across_stop)
+                & self.solid(along_cell, across_cell, vertical)
+                & (side < across + PLAYER_SIZE) & (side + CELL_SIZE > across)
+                & (low < along + PLAYER_SIZE) & (low + CELL_SIZE > along)
+            )
+            along = np.where(overlapping, self.push_out(along, low, push_negative), along)
+            colliding |= overlapping
+        return along, colliding
+
+    def out_of_bounds(self, idx: np.ndarray) -> np.ndarray:
+        height, width = self.cells.shape
+        x, y = self.x[idx], self.y[idx]
+        return (x < 0) | (y < 0) | (x > (width + 1) * CELL_SIZE) | (y > (height + 1) * CELL_SIZE)
+
+    def die(self, idx: np.ndarray) -> None:
+        self.deaths[idx] += 1
+        self.momentum_x[idx] = 0.0
+        self.momentum_y[idx] = 0.0
+        self.can_jump[idx] = False
+        self.can_dash[idx] = False
+        self.dash_timer[idx] = 0.0
+        self.update_timeout[idx] = RESPAWN_TIMEOUT
+        checkpoint = self.active_checkpoint[idx]
+        at_checkpoint = checkpoint >= 0
+        if len(self.checkpoint_positions):
+            position = self.checkpoint_positions[np.maximum(checkpoint, 0)]
+            self.x[idx] = np.where(at_checkpoint, position[:, 0], self.spawn[0])
+            self.y[idx] = np.where(at_checkpoint, position[:, 1], self.spawn[1])
+        else:
+            self.x[idx] = self.spawn[0]
+            self.y[idx] = self.spawn[1]
+
+    def handle_specials(self, idx: np.ndarray, delta_time: float) -> None:
+        self.jump_orb_timers[idx] -= delta_time
+        self.dash_orb_timers[idx] -= delta_time
+        if len(self.touchables):
+            touched = self.overlapping(self.touchables, idx)
+            for j in np.flatnonzero(touched.any(axis=0)):
+                kind, column = self.touchable_kinds[j], self.touchable_columns[j]
+                hit_idx = idx[touched[:, j]]
+                if kind == JUMP_PAD:
+                    self.momentum_y[hit_idx] = JUMP_PAD_MOMENTUM
+                    self.can_jump[hit_idx] = True
+                    self.can_dash[hit_idx] = True
+                    continue
+                timers, ability = (
+                    (self.jump_orb_timers, self.can_jump) if kind == JUMP_ORB else (self.dash_orb_timers, self.can_dash)
+                )
+                ready_idx = hit_idx[(timers[hit_idx, column] <= 0) & ~ability[hit_idx]]
+                timers[ready_idx, column] = ORB_COOLDOWN
+                ability[ready_idx] = True
+        if len(self.checkpoints):
+            touched = self.overlapping(self.checkpoints, idx)
+            reached = touched.any(axis=1)
+            last = touched.shape[1] - 1 - touched[:, ::-1].argmax(axis=1)
+            self.active_checkpoint[idx[reached]] = last[reached]
+        if len(self.room_finishes):
+            finished_idx = idx[self.overlapping(self.room_finishes, idx).any(axis=1)]
+            self.finished[finished_idx] = True
+            self.finish_tick[finished_idx] = self.tick
+
+    def handle_vertical_movement(self, idx: np.ndarray, delta_time: float) -> None:
+        falling = self.dash_timer[idx] <= 0
+        momentum = np.where(falling, self.momentum_y[idx] + GRAVITY * delta_time, self.momentum_y[idx])
+        distance = np.where(falling, momentum * delta_time, 0.0)
+        held = self.grabbing_wall[idx] & (momentum > 0)
+        distance = np.where(held, distance - momentum * delta_time, distance)
+        momentum = np.where(held, 0.0, momentum)
+        self.y[idx], colliding = self.move_axis(self.y[idx], self.x[idx], distance, momentum > 0, True)
+        self.momentum_y[idx] = momentum
+        hit_idx = idx[colliding]
+        landed_idx = idx[colliding & (momentum > 0)]
+        self.dash_timer[hit_idx] = 0.0
+        self.can_jump[landed_idx] = True
+        self.can_dash[landed_idx] = True
+        self.momentum_y[hit_idx] = 0.0
+
+    def handle_horizontal_movement(self, idx: np.ndarray, delta_time: float) -> None:
+        self.grabbing_wall[idx] = False
+        dashing = self.dash_timer[idx] > 0
+        self.momentum_x[idx] = np.where(dashing, self.dash_momentum[idx], self.momentum_x[idx])
+        momentum = self.momentum_x[idx]
+        self.x[idx], colliding = self.move_axis(self.x[idx], self.y[idx], momentum * delta_time, momentum >= 0, False)
+        hit_idx = idx[colliding]
+        self.can_jump[hit_idx] = True
+        self.can_dash[hit_idx] = True
+        self.grabbing_wall[hit_idx] = True
+        self.momentum_x[hit_idx] = 0.0
+
+    def handle_jump_and_dash(self, idx: np.ndarray, delta_time: float) -> None:
+        jump_idx = idx[self.should_jump[idx] & self.can_jump[idx]]
+        self.y[jump_idx] -= 1
+        self.momentum_y[jump_idx] = JUMP_MOMENTUM
+        self.can_jump[jump_idx] = False
+        self.should_jump[idx] = False
+        self.dash_timer[idx] -= delta_time
+        self.dash_timeout[idx] -= delta_time
+        dash_idx = idx[
+            self.should_dash[idx] & self.can_dash[idx]
+            & (self.dash_timeout[idx] <= 0) & (self.momentum_x[idx] != 0)
+        ]
+        self.momentum_y[dash_idx] = np.minimum(self.momentum_y[dash_idx], 0)
+        self.can_dash[dash_idx] = False
+        self.dash_timer[dash_idx] = DASH_DURATION
+        self.y[dash_idx] = np.trunc(self.y[dash_idx] + 1)
+        self.dash_momentum[dash_idx] = self.momentum_x[dash_idx] * DASH_MULTIPLIER
+        self.dash_timeout[dash_idx] = DASH_COOLDOWN
+        self.should_dash[idx] = False
+
+    def step(self, inputs: np.ndarray, delta_time: float) -> None:
+        idx = np.flatnonzero(~self.finished)
+        pressed = inputs[idx]
+        released = idx[(pressed & JUMP_RELEASE != 0) & (self.momentum_y[idx] < 0)]
+        if self.full_jump_release:
+            self.momentum_y[released] = 0
+        else:
+            self.momentum_y[released] /= 3
+        self.should_jump[idx] |= pressed & JUMP != 0
+        self.should_dash[idx] |= pressed & DASH != 0
+        in_timeout = self.update_timeout[idx] > 0
+        self.update_timeout[idx[in_timeout]] -= delta_time
+        idx = idx[~in_timeout]
+        pressed = inputs[idx]
+        self.momentum_x[idx] = (
+            np.where(pressed & RIGHT != 0, RUN_SPEED, 0) - np.where(pressed & LEFT != 0, RUN_SPEED, 0)
+        ).astype(np.float64)
+        self.handle_specials(idx, delta_time)
+        idx = idx[~self.finished[idx]]
+        self.handle_vertical_movement(idx, delta_time)
+        self.handle_horizontal_movement(idx, delta_time)
+        self.die(idx[self.out_of_bounds(idx)])
+        self.die(idx[self.touching(idx, DEADLY)])
+        self.handle_jump_and_dash(idx, delta_time)
+        self.tick += 1
+
+    def run(self, inputs: np.ndarray, delta_time: float) -> None:
+        for tick_inputs in inputs:
+            self.step(tick_inputs, delta_time)
+
+
+def synthetic_room(seed: int) -> np.ndarray:
+    from CollisionGrid import GRID_WIDTH, GRID_HEIGHT
+    random = np.random.default_rng(seed)
+    pixels = np.zeros((GRID_HEIGHT, GRID_WIDTH, 3), dtype=np.uint8)
+    roll = random.random((GRID_HEIGHT, GRID_WIDTH))
+    pixels[roll < 0.08] = (255, 255, 255)
+    pixels[(roll >= 0.08) & (roll < 0.09)] = (255, 0, 0)
+    specials = ((0, 255, 0), (0, 0, 255), (255, 0, 255), (0, 127, 127))
+    for i, color in enumerate(specials):
+        pixels[(roll >= 0.09 + i * 0.03) & (roll < 0.12 + i * 0.03)] = color
+    pixels[0, :] = pixels[-1, :] = pixels[:, 0] = pixels[:, -1] = (255, 255, 255)
+    pixels[GRID_HEIGHT - 4:GRID_HEIGHT - 1, 1:4] = 0
+    pixels[GRID_HEIGHT - 2, 2] = (255, 255, 0)
+    pixels[1, GRID_WIDTH - 2] = (0, 255, 255)
+    return pixels
+
+
+def input_masks(ticks: int, seed: int) -> np.ndarray:
+    random = np.random.default_rng(seed)
+    masks = np.zeros(ticks, dtype=np.int64)
+    held = 0
+    for tick in range(ticks):
+        if random.random() < 0.05:
+            held = int(random.choice((0, LEFT, RIGHT)))
+        masks[tick] = held
+        if random.random() < 0.08:
+            masks[tick] |= JUMP
+        elif random.random() < 0.1:
+            masks[tick] |= JUMP_RELEASE
+        if random.random() < 0.03:
+            masks[tick] |= DASH
+    return masks
+
+
+def check_against_simulation(seed: int, players: int, ticks: int, delta_time: float) -> int | None:
+    from MapParser import parse_room
+    from Simulation import Simulation
+    pixels = synthetic_room(seed)
+    walls, specials = parse_room(pixels)
+    batch = BatchPhysics(walls, specials, players)
+    inputs = np.stack([input_masks(ticks, seed * players + player) for player in range(players)], axis=1)
+    simulations = [Simulation([walls], [parse_room(pixels)[1]], True) for _ in range(players)]
+    for tick in range(ticks):
+        batch.step(inputs[tick], delta_time)
+        for player, simulation in enumerate(simulations):
+            if simulation.finished:
+                continue
+            mask = int(inputs[tick, player])
+            if mask & JUMP_RELEASE:
+                simulation.release(JUMP)
+            for action in (LEFT, RIGHT):
+                if mask & action:
+                    simulation.press(action)
+                else:
+                    simulation.release(action)
+            for action in (JUMP, DASH):
+                if mask & action:
+                    simulation.press(action)
+            simulation.step(delta_time)
+            collider = simulation.player_collider
+            if (
+                collider.x, collider.y, simulation.momentum_x, simulation.momentum_y,
+                simulation.can_jump, simulation.can_dash, simulation.player_deaths, simulation.finished
+            ) != (
+                batch.x[player], batch.y[player], batch.momentum_x[player], batch.momentum_y[player],
+                batch.can_jump[player], batch.can_dash[player], batch.deaths[player], batch.finished[player]
+            ):
+                return tick
+    return None
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+    parser = ArgumentParser(description="Check that BatchPhysics follows Simulation tick for tick on synthetic rooms")
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--players", type=int, default=8)
+    parser.add_argument("--ticks", type=int, default=3000)
+    parser.add_argument("--tick-rate", type=int, default=120)
+    arguments = parser.parse_args()
+    diverged = 0
+    for seed in range(arguments.rooms):
+        tick = check_against_simulation(seed, arguments.players, arguments.ticks, 1 / arguments.tick_rate)
+        if tick is not None:
+            diverged += 1
+            print(f"room {seed}: diverged at tick {tick}")
+    print(f"{arguments.rooms - diverged}/{arguments.rooms} rooms match")
+    raise SystemExit(1 if diverged else 0)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+from argparse import ArgumentParser
+from collections.abc import Callable
+from ctypes import c_void_p
+from json import dump, load
+from os import chdir, environ
+from pathlib import Path
+from platform import platform as platform_name, python_version
+from shutil import rmtree
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import sys
+import numpy as np
+environ.setdefault("SDL_VIDEODRIVER", "dummy")
+from sdl2 import *
+from sdl2.sdlimage import *
+from sdl2.sdlttf import *
+from CollisionGrid import GRID_WIDTH, GRID_HEIGHT, CELL_SIZE
+from MapCache import load_room, room_count
+from MapLoader import MapLoader
+from MapParser import classify_room, build_specials
+from ParticleSystem import ParticleSystem, circle_surface
+from Physics import LEFT, RIGHT, JUMP, DASH
+from Platformer import Platformer
+from Simulation import Simulation
+from SpriteAtlas import SpriteAtlas
+import CommonScreenBuffer as ComSB
+
+
+WALL = (255, 255, 255)
+SPAWN = (255, 255, 0)
+JUMP_ORB = (0, 0, 255)
+DASH_ORB = (255, 0, 255)
+CHECKPOINT = (0, 127, 127)
+FINISH = (0, 255, 255)
+
+DENSITIES = (0.0, 0.1, 0.25, 0.4)
+MAP_SIZES = (1, 10, 50)
+TICK_RATE = 120
+
+
+def synthetic_room(density: float, seed: int) -> np.ndarray:
+    random = np.random.default_rng(seed)
+    pixels = np.zeros((GRID_HEIGHT, GRID_WIDTH, 3), dtype=np.uint8)
+    pixels[random.random((GRID_HEIGHT, GRID_WIDTH)) < density] = WALL
+    pixels[0, :] = pixels[-1, :] = pixels[:, 0] = pixels[:, -1] = WALL
+    pixels[GRID_HEIGHT - 6:GRID_HEIGHT - 1, 1:6] = 0
+    pixels[GRID_HEIGHT - 2, 2] = SPAWN
+    pixels[GRID_HEIGHT - 2, GRID_WIDTH - 2] = FINISH
+    for color in (JUMP_ORB, DASH_ORB, CHECKPOINT):
+        for _ in range(4):
+            pixels[random.integers(1, GRID_HEIGHT - 1), random.integers(1, GRID_WIDTH - 1)] = color
+    return pixels
+
+
+def save_png(pixels: np.ndarray, path: Path) -> None:
+    pixels = np.ascontiguousarray(pixels)
+    height, width, _ = pixels.shape
+    surface = SDL_CreateRGBSurfaceWithFormatFrom(
+        c_void_p(pixels.ctypes.data), width, height, 24, width * 3, SDL_PIXELFORMAT_RGB24
+    )
+    if IMG_SavePNG(surface, str(path).encode()) != 0:
+        raise OSError(f"Could not write {path}: {IMG_GetError().decode()}")
+    SDL_FreeSurface(surface)
+
+
+def write_synthetic_map(folder: Path, rooms: int) -> None:
+    folder.mkdir(parents=True, exist_ok=True)
+    for room in range(1, rooms + 1):
+        pixels = synthetic_room(0.1, room)
+        background = np.repeat(np.repeat(pixels // 2 + 32, CELL_SIZE, axis=0), CELL_SIZE, axis=1)
+        save_png(pixels, folder / f"obj{room}.png")
+        save_png(background, folder / f"bg{room}.png")
+
+
+def input_script(ticks: int, seed: int) -> list[list[tuple[int, bool]]]:
+    random = np.random.default_rng(seed)
+    script: list[list[tuple[int, bool]]] = [[] for _ in range(ticks)]
+    direction = RIGHT
+    for tick in range(0, ticks, 30):
+        script[tick].append((direction, False))
+        direction = LEFT if random.random() < 0.5 else RIGHT
+        script[tick].append((direction, True))
+        if random.random() < 0.6:
+            script[tick].append((JUMP, True))
+            script[min(tick + 12, ticks - 1)].append((JUMP, False))
+        if random.random() < 0.2:
+            script[min(tick + 6, ticks - 1)].append((DASH, True))
+    return script
+
+
+def best_of(repeat: int, run: Callable[[], float]) -> float:
+    return min(run() for _ in range(repeat))
+
+
+def bench_simulation(density: float, ticks: int = 6000) -> float:
+    walls, table = classify_room(synthetic_room(density, 7))
+    specials = build_specials(table)
+    simulation = Simulation([walls], [specials], True)
+    script = input_script(ticks, 11)
+    delta_time = 1 / TICK_RATE
+    started = perf_counter()
+    for events in script:
+        for action, pressed in events:
+            if pressed:
+                simulation.press(action)
+            else:
+                simulation.release(action)
+        simulation.step(delta_time)
+        if simulation.finished:
+            simulation = Simulation([walls], [build_specials(table)], True)
+    return ticks / (perf_counter() - started)
+
+
+def bench_classify(rounds: int = 200) -> float:
+    rooms = [synthetic_room(0.25, seed) for seed in range(rounds)]
+    started = perf_counter()
+    for pixels in rooms:
+        classify_room(pixels)
+    return (perf_counter() - started) / rounds * 1e6
+
+
+def bench_build_specials(rounds: int = 200) -> float:
+    tables = [classify_room(synthetic_room(0.25, seed))[1] for seed in range(rounds)]
+    started = perf_counter()
+    for table in tables:
+        build_specials(table)
+    return (perf_counter() - started) / rounds * 1e6
+
+
+def bench_load_room(maps_folder: Path, cache_folder: Path, map_name: str, rooms: int, cold: bool) -> float:
+    if cold:
+        rmtree(cache_folder, ignore_errors=True)
+    started = perf_counter()
+    for room in range(1, rooms + 1):
+        load_room(map_name, room, maps_folder, cache_folder)
+    return (perf_counter() - started) / rooms * 1e3
+
+
+def bench_load_map(renderer: SDL_Renderer, maps_folder: Path, cache_folder: Path, map_name: str, cold: bool) -> float:
+    if cold:
+        rmtree(cache_folder, ignore_errors=True)
+    started = perf_counter()
+    look_ahead = room_count(map_name, maps_folder)
+    loader = MapLoader(map_name, look_ahead, maps_folder=maps_folder, cache_folder=cache_folder)
+    while not loader.is_settled():
+        loader.poll(renderer, loader.room_count)
+    elapsed = perf_counter() - started
+    loader.quit()
+    return elapsed * 1e3
+
+
+def bench_draw(
+    renderer: SDL_Renderer, window: SDL_Window, maps_folder: Path, cache_folder: Path, map_name: str, frames: int = 300
+) -> float:
+    controls = {"left": "a", "right": "d", "jump": "w", "dash": "space", "full jump release": True}
+    platformer = Platformer((1920, 1080), controls, renderer, TICK_RATE)
+    loader = MapLoader(map_name, maps_folder=maps_folder, cache_folder=cache_folder)
+    while not loader.is_settled():
+        loader.poll(renderer, loader.room_count)
+    platformer.on_enter((loader, None))
+    platformer.update(lambda data: None, 1 / TICK_RATE)
+    started = perf_counter()
+    for frame in range(frames):
+        platformer.draw(window, renderer, frame / frames)
+        SDL_RenderPresent(renderer)
+    elapsed = perf_counter() - started
+    platformer.quit()
+    return frames / elapsed
+
+
+def bench_particles(renderer: SDL_Renderer, frames: int = 600) -> float:
+    particle = circle_surface()
+    atlas = SpriteAtlas(renderer, {"particle": particle})
+    SDL_FreeSurface(particle)
+    particles = ParticleSystem(atlas, "particle")
+    random = np.random.default_rng(5)
+    bursts = random.integers((0, 0), (1920, 1080), (frames, 2))
+    started = perf_counter()
+    for x, y in bursts:
+        particles.burst(x, y, (255, 255, 0))
+        particles.update(1 / TICK_RATE)
+        particles.draw(renderer, 0, 0)
+        SDL_RenderPresent(renderer)
+    elapsed = perf_counter() - started
+    atlas.destroy()
+    return frames / elapsed
+
+
+def run_benchmarks(repeat: int, workspace: Path) -> dict[str, dict]:
+    maps_folder = workspace / "maps"
+    cache_folder = workspace / "cache" / "maps"
+    results: dict[str, dict] = {}
+
+    def record(name: str, value: float, unit: str, higher_is_better: bool) -> None:
+        results[name] = {"value": value, "unit": unit, "higher is better": higher_is_better}
+        print(f"{name:<32} {value:12.2f} {unit}", file=sys.stderr)
+
+    for density in DENSITIES:
+        ticks_per_second = max(bench_simulation(density) for _ in range(repeat))
+        record(f"simulation/density {density:.2f}", ticks_per_second, "ticks/s", True)
+    record("parse/classify room", best_of(repeat, bench_classify), "us/room", False)
+    record("parse/build specials", best_of(repeat, bench_build_specials), "us/room", False)
+    for rooms in MAP_SIZES:
+        write_synthetic_map(maps_folder / f"rooms{rooms}", rooms)
+    for cold in (True, False):
+        state = "cold" if cold else "warm"
+        elapsed = best_of(repeat, lambda: bench_load_room(maps_folder, cache_folder, "rooms10", 10, cold))
+        record(f"parse/load room {state}", elapsed, "ms/room", False)
+    window = SDL_CreateWindow(b"benchmark", SDL_WINDOWPOS_UNDEFINED, SDL_WINDOWPOS_UNDEFINED, 1920, 1080, SDL_WINDOW_HIDDEN)
+    renderer = SDL_CreateRenderer(window, -1, 0)
+    SDL_SetRenderDrawBlendMode(renderer, SDL_BLENDMODE_BLEND)
+    ComSB.init(renderer)
+    for rooms in MAP_SIZES:
+        for cold in (True, False):
+            state = "cold" if cold else "warm"
+            elapsed = best_of(repeat, lambda: bench_load_map(renderer, maps_folder, cache_folder, f"rooms{rooms}", cold))
+            record(f"load/{rooms} rooms {state}", elapsed, "ms", False)
+    frames_per_second = max(bench_draw(renderer, window, maps_folder, cache_folder, "rooms1") for _ in range(repeat))
+    record("draw/platformer", frames_per_second, "frames/s", True)
+    record("draw/particles", max(bench_particles(renderer) for _ in range(repeat)), "frames/s", True)
+    ComSB.quit()
+    SDL_DestroyRenderer(renderer)
+    SDL_DestroyWindow(window)
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        previous = baseline[name]["value"]
+        change = (result["value"] - previous) / previous if previous else 0.0
+        if result["higher is better"]:
+            change = -change
+        status = "REGRESSION" if change > threshold else "ok"
+        print(f"{name:<32} {previous:12.2f} -> {result['value']:12.2f} {result['unit']:<9} {-change:+7.1%} {status}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    parser = ArgumentParser(description="Benchmark physics, map parsing, loading and drawing on synthetic maps")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare against a previous --output file")
+    parser.add_argument("--threshold", type=float, default=0.15, help="relative slowdown flagged as a regression")
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+    output = arguments.output.resolve() if arguments.output else None
+    baseline = None
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            baseline = load(file)["results"]
+    assets = Path.cwd() / "assets"
+    SDL_Init(SDL_INIT_VIDEO)
+    IMG_Init(IMG_INIT_PNG)
+    TTF_Init()
+    with TemporaryDirectory(prefix="nano-platformer-benchmark-") as workspace:
+        chdir(workspace)
+        Path("assets").symlink_to(assets)
+        results = run_benchmarks(arguments.repeat, Path(workspace))
+    TTF_Quit()
+    IMG_Quit()
+    SDL_Quit()
+    report = {"python": python_version(), "platform": platform_name(), "results": results}
+    if output is not None:
+        with open(output, "w") as file:
+            dump(report, file, indent=2)
+    else:
+        dump(report, sys.stdout, indent=2)
+        print()
+    if baseline is None:
+        return 0
+    regressions = compare(results, baseline, arguments.threshold)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
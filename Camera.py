@@ -0,0 +1,16 @@
+from Physics import PLAYER_SIZE
+
+
+class Camera:
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.x = 0
+        self.y = 0
+
+    def follow(self, x: float, y: float, room_width: int, room_height: int) -> None:
+        self.x = round(min(max(x + PLAYER_SIZE / 2 - self.width / 2, 0), max(room_width - self.width, 0)))
+        self.y = round(min(max(y + PLAYER_SIZE / 2 - self.height / 2, 0), max(room_height - self.height, 0)))
+
+    def view(self) -> tuple[int, int, int, int]:
+        return self.x, self.y, self.width, self.height
@@ -14,3 +14,24 @@ class ColliderBox:
         horizontal = self.x < another.x + another.width and self.x + self.width > another.x
         vertical = self.y < another.y + another.height and self.y + self.height > another.y
         return horizontal and vertical
+
+    def time_of_impact(self, moving: Self, dx: float, dy: float) -> float | None:
+        if self.is_colliding(moving):
+            return None
+        entry, leave = 0.0, 1.0
+        for position, size, delta, low, high in (
+            (moving.x, moving.width, dx, self.x, self.x + self.width),
+            (moving.y, moving.height, dy, self.y, self.y + self.height)
+        ):
+            if delta == 0:
+                if not (position < high and position + size > low):
+                    return None
+            elif delta > 0:
+                entry = max(entry, (low - position - size) / delta)
+                leave = min(leave, (high - position) / delta)
+            else:
+                entry = max(entry, (high - position) / delta)
+                leave = min(leave, (low - position - size) / delta)
+        if entry < leave:
+            return entry
+        return None
@@ -0,0 +1,72 @@
+from math import floor, ceil
+from ColliderBox import ColliderBox
+
+
+EMPTY = 0
+SOLID = 1
+DEADLY = 2
+
+CELL_SIZE = 24
+GRID_WIDTH = 80
+GRID_HEIGHT = 45
+
+
+class CollisionGrid:
+    def __init__(self, width: int = GRID_WIDTH, height: int = GRID_HEIGHT, cells: bytearray | None = None) -> None:
+        self.width = width
+        self.height = height
+        if cells is None:
+            cells = bytearray(width * height)
+        if len(cells) != width * height:
+            raise ValueError(f"Expected {width * height} cells, got {len(cells)}")
+        self.cells = cells
+
+    def get(self, x: int, y: int) -> int:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cells[y * self.width + x]
+        return EMPTY
+
+    def set(self, x: int, y: int, kind: int) -> None:
+        self.cells[y * self.width + x] = kind
+
+    def cell_range(self, collider: ColliderBox, margin: int = 0) -> tuple[range, range]:
+        x0 = max(floor(collider.x / CELL_SIZE) - margin, 0)
+        y0 = max(floor(collider.y / CELL_SIZE) - margin, 0)
+        x1 = min(ceil((collider.x + collider.width) / CELL_SIZE) + margin, self.width)
+        y1 = min(ceil((collider.y + collider.height) / CELL_SIZE) + margin, self.height)
+        return range(x0, x1), range(y0, y1)
+
+    def walls_near(self, collider: ColliderBox, kind: int = SOLID, margin: int = 1) -> list[ColliderBox]:
+        columns, rows = self.cell_range(collider, margin)
+        walls = []
+        for x in columns:
+            for y in rows:
+                if self.cells[y * self.width + x] == kind:
+                    walls.append(ColliderBox(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE, kind == DEADLY))
+        return walls
+
+    def walls_along(self, collider: ColliderBox, dx: float, dy: float, kind: int = SOLID) -> list[ColliderBox]:
+        swept = ColliderBox(
+            min(collider.x, collider.x + dx),
+            min(collider.y, collider.y + dy),
+            collider.width + abs(dx),
+            collider.height + abs(dy)
+        )
+        return self.walls_near(swept, kind, 0)
+
+    def sweep(self, collider: ColliderBox, dx: float, dy: float, kind: int = SOLID) -> tuple[float, ColliderBox | None]:
+        first_time, first_wall = 1.0, None
+        for wall in self.walls_along(collider, dx, dy, kind):
+            time = wall.time_of_impact(collider, dx, dy)
+            if time is not None and time < first_time:
+                first_time, first_wall = time, wall
+        return first_time, first_wall
+
+    def is_touching(self, collider: ColliderBox, kind: int) -> bool:
+        columns, rows = self.cell_range(collider)
+        for y in rows:
+            row = y * self.width
+            for x in columns:
+                if self.cells[row + x] == kind:
+                    return True
+        return False
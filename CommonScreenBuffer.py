@@ -1,16 +1,80 @@
+from ctypes import byref, c_float, c_int
 from sdl2 import *
 
 
+WIDTH = 1920
+HEIGHT = 1080
+
 _screen_buffer: SDL_Texture | None = None
+_renderer: SDL_Renderer | None = None
+_render_size: tuple[int, int] = WIDTH, HEIGHT
+_integer_scaling = True
+_destination = SDL_Rect(0, 0, WIDTH, HEIGHT)
 
-def init(renderer: SDL_Renderer):
-    global _screen_buffer
-    _screen_buffer = SDL_CreateTexture(renderer, SDL_PIXELFORMAT_RGBA32, SDL_TEXTUREACCESS_TARGET, 1920, 1080)
+def init(renderer: SDL_Renderer, render_size: tuple[int, int] = (WIDTH, HEIGHT), integer_scaling: bool = True):
+    global _screen_buffer, _renderer, _render_size, _integer_scaling
+    _renderer = renderer
+    _render_size = render_size
+    _integer_scaling = integer_scaling
+    if render_size == (WIDTH, HEIGHT):
+        _screen_buffer = None
+        SDL_RenderSetLogicalSize(renderer, WIDTH, HEIGHT)
+        return
+    _screen_buffer = SDL_CreateTexture(renderer, SDL_PIXELFORMAT_RGBA32, SDL_TEXTUREACCESS_TARGET, *render_size)
     SDL_SetTextureBlendMode(_screen_buffer, SDL_BLENDMODE_BLEND)
+    SDL_SetTextureScaleMode(_screen_buffer, SDL_ScaleModeNearest)
+    update_destination()
 
 def quit():
-    global _screen_buffer
-    SDL_DestroyTexture(_screen_buffer)
+    global _screen_buffer, _renderer
+    if _screen_buffer is not None:
+        SDL_DestroyTexture(_screen_buffer)
+    _screen_buffer = None
+    _renderer = None
 
 def screen_buffer():
     return _screen_buffer
+
+def retains_frame() -> bool:
+    return _screen_buffer is not None
+
+def begin(renderer: SDL_Renderer) -> None:
+    SDL_SetRenderTarget(renderer, _screen_buffer)
+    if _screen_buffer is not None:
+        SDL_RenderSetScale(renderer, _render_size[0] / WIDTH, _render_size[1] / HEIGHT)
+
+def finish(renderer: SDL_Renderer) -> None:
+    SDL_SetRenderTarget(renderer, None)
+    if _screen_buffer is not None:
+        SDL_SetRenderDrawColor(renderer, 0, 0, 0, SDL_ALPHA_OPAQUE)
+        SDL_RenderClear(renderer)
+        update_destination()
+        SDL_RenderCopy(renderer, _screen_buffer, None, byref(_destination))
+
+def update_destination() -> None:
+    output_width, output_height = c_int(0), c_int(0)
+    SDL_GetRendererOutputSize(_renderer, byref(output_width), byref(output_height))
+    width, height = _render_size
+    scale = min(output_width.value / width, output_height.value / height)
+    if _integer_scaling and scale >= 1:
+        scale = int(scale)
+    _destination.w = int(width * scale)
+    _destination.h = int(height * scale)
+    _destination.x = (output_width.value - _destination.w) // 2
+    _destination.y = (output_height.value - _destination.h) // 2
+
+def window_to_screen(position: tuple[int, int]) -> tuple[int, int]:
+    x, y = position
+    if _screen_buffer is None:
+        logical_x, logical_y = c_float(0), c_float(0)
+        SDL_RenderWindowToLogical(_renderer, x, y, byref(logical_x), byref(logical_y))
+        return int(logical_x.value), int(logical_y.value)
+    return (
+        (x - _destination.x) * WIDTH // max(_destination.w, 1),
+        (y - _destination.y) * HEIGHT // max(_destination.h, 1)
+    )
+
+def mouse_position() -> tuple[int, int]:
+    x, y = c_int(0), c_int(0)
+    SDL_GetMouseState(byref(x), byref(y))
+    return window_to_screen((x.value, y.value))
@@ -0,0 +1,126 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from os import replace, utime, getpid
+from pathlib import Path
+from threading import get_ident
+from sdl2 import *
+from sdl2.sdlimage import *
+
+
+THUMBNAILS_FOLDER = Path.cwd() / "cache" / "covers"
+COVER_SIZE = 384, 216
+COVER_SOURCES = ("cover.png", "bg1.png")
+
+
+def cover_source(folder: Path) -> Path | None:
+    for name in COVER_SOURCES:
+        if (folder / name).is_file():
+            return folder / name
+    return None
+
+
+def thumbnail_path(map_name: str) -> Path:
+    return THUMBNAILS_FOLDER / f"{map_name}.png"
+
+
+def load_thumbnail(source: Path, map_name: str) -> SDL_Surface | None:
+    path = thumbnail_path(map_name)
+    try:
+        stat = source.stat()
+    except OSError:
+        return None
+    try:
+        if path.stat().st_mtime_ns == stat.st_mtime_ns:
+            cached = IMG_Load(str(path).encode())
+            if cached:
+                return cached
+    except OSError:
+        pass
+    raw = IMG_Load(str(source).encode())
+    if not raw:
+        return None
+    thumbnail = SDL_CreateRGBSurfaceWithFormat(0, *COVER_SIZE, 32, SDL_PIXELFORMAT_RGBA32)
+    SDL_SetSurfaceBlendMode(raw, SDL_BLENDMODE_NONE)
+    SDL_BlitScaled(raw, None, thumbnail, None)
+    SDL_FreeSurface(raw)
+    temporary = path.with_suffix(f".{getpid()}.{get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if IMG_SavePNG(thumbnail, str(temporary).encode()) == 0:
+            utime(temporary, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            replace(temporary, path)
+    except OSError:
+        pass
+    return thumbnail
+
+
+class CoverCache:
+    def __init__(self, renderer: SDL_Renderer, capacity: int, workers: int | None = None) -> None:
+        self.renderer = renderer
+        self.capacity = capacity
+        self.textures: OrderedDict[str, tuple[tuple | None, SDL_Texture | None]] = OrderedDict()
+        self.futures: dict[str, tuple[tuple, Future]] = {}
+        self.pool = ThreadPoolExecutor(workers)
+
+    def request(self, folder: Path) -> None:
+        name = folder.name
+        source = cover_source(folder)
+        stamp = (source, source.stat().st_mtime_ns) if source is not None else None
+        if name in self.textures and self.textures[name][0] == stamp:
+            self.textures.move_to_end(name)
+            return
+        if name in self.futures and self.futures[name][0] == stamp:
+            return
+        if source is None:
+            self.store(name, None, None)
+            return
+        self.futures[name] = stamp, self.pool.submit(load_thumbnail, source, name)
+
+    def store(self, name: str, stamp: tuple | None, texture: SDL_Texture | None) -> None:
+        previous = self.textures.pop(name, None)
+        if previous is not None and previous[1] is not None:
+            SDL_DestroyTexture(previous[1])
+        self.textures[name] = stamp, texture
+        while len(self.textures) > self.capacity:
+            _, (_, evicted) = self.textures.popitem(last=False)
+            if evicted is not None:
+                SDL_DestroyTexture(evicted)
+
+    def discard(self, name: str) -> None:
+        entry = self.textures.pop(name, None)
+        if entry is not None and entry[1] is not None:
+            SDL_DestroyTexture(entry[1])
+
+    def poll(self) -> bool:
+        done = [name for name, (_, future) in self.futures.items() if future.done()]
+        for name in done:
+            stamp, future = self.futures.pop(name)
+            surface = future.result()
+            texture = None
+            if surface:
+                texture = SDL_CreateTextureFromSurface(self.renderer, surface)
+                SDL_FreeSurface(surface)
+            self.store(name, stamp, texture)
+        return len(done) > 0
+
+    def is_pending(self, name: str | None = None) -> bool:
+        if name is None:
+            return len(self.futures) > 0
+        return name in self.futures
+
+    def cover(self, name: str) -> SDL_Texture | None:
+        entry = self.textures.get(name)
+        return entry[1] if entry is not None else None
+
+    def quit(self) -> None:
+        for _, future in self.futures.values():
+            future.cancel()
+        self.pool.shutdown(wait=True)
+        for _, future in self.futures.values():
+            if not future.cancelled() and future.exception() is None and future.result():
+                SDL_FreeSurface(future.result())
+        self.futures.clear()
+        for _, texture in self.textures.values():
+            if texture is not None:
+                SDL_DestroyTexture(texture)
+        self.textures.clear()
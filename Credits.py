@@ -3,32 +3,31 @@ from typing import Any
 from sdl2 import *
 from Scene import Scene
 from Button import Button
-from CommonScreenBuffer import screen_buffer
-from useful import load_image_as_texture
+from UI import UI
+from Assets import assets
 
 
 class Credits(Scene):
     def __init__(self, *args, **kwargs) -> None:
         self.window_size: tuple[int, int] = args[0]
         renderer = args[1]
-        self.the_credits = load_image_as_texture(b"./assets/credits.png", renderer)
-        self.back_button = Button(renderer, "back", (-1, 1000), self.window_size)
+        self.the_credits = assets().texture(renderer, "credits.png")
+        self.back_button = Button(renderer, "back", (-1, 1000))
+        self.ui = UI([self.back_button])
         self.should_quit = False
 
     def update(self, data_setter: Callable[[Any], None], delta_time: float) -> None | str:
-        self.back_button.update()
         if self.should_quit:
             self.should_quit = False
             return "Main menu"
         return None
 
-    def draw(self, window: SDL_Window, renderer: SDL_Renderer) -> None:
-        SDL_SetRenderTarget(renderer, screen_buffer())
+    def draw(self, window: SDL_Window, renderer: SDL_Renderer, interpolation: float) -> None:
+        self.ui.present(renderer, self.compose)
+
+    def compose(self, renderer: SDL_Renderer) -> None:
         SDL_RenderCopy(renderer, self.the_credits, None, None)
         self.back_button.draw(renderer)
-        SDL_SetRenderTarget(renderer, None)
-        SDL_RenderCopy(renderer, screen_buffer(), None, None)
-        SDL_RenderPresent(renderer)
 
     def on_mouse_button_down(self, position: tuple[int, int]) -> None:
         if self.back_button.hovering:
@@ -37,6 +36,15 @@ class Credits(Scene):
     def on_key_down(self, key: int) -> None:
         pass
 
+    def on_mouse_motion(self, position: tuple[int, int]) -> None:
+        self.ui.on_mouse_motion(position)
+
+    def is_idle(self) -> bool:
+        return not self.should_quit and self.ui.is_idle()
+
+    def invalidate(self) -> None:
+        self.ui.invalidate()
+
     def on_mouse_button_up(self, position: tuple[int, int]) -> None:
         pass
 
@@ -44,8 +52,8 @@ class Credits(Scene):
         pass
 
     def on_enter(self, data: Any) -> None:
-        pass
+        self.ui.refresh()
 
     def quit(self) -> None:
-        SDL_DestroyTexture(self.the_credits)
+        assets().release(self.the_credits)
         self.back_button.destroy()
@@ -1,8 +1,8 @@
 from json import load
 from ctypes import byref
+from functools import partial
 
 from sdl2 import *
-from sdl2.sdlimage import *
 
 from Intro import Intro
 from MainMenu import MainMenu
@@ -12,10 +12,20 @@ from SceneManager import SceneManager
 from Loading import Loading
 from Platformer import Platformer
 from MapCompleted import MapCompleted
+from Replay import Replay
+from Profiler import profiler, EVENTS, OVERLAY, PRESENT, WAIT
+from ProfilerOverlay import ProfilerOverlay
+from Input import Input, CONTROLLER_EVENTS
+from Assets import assets
 
 import CommonScreenBuffer as ComSB
 
 
+IDLE_WAIT_MS = 250
+SLEEP_MARGIN_MS = 2
+EVICT_ON_LEAVE = {"Intro", "Credits", "Map completed"}
+INVALIDATING_WINDOW_EVENTS = (SDL_WINDOWEVENT_EXPOSED, SDL_WINDOWEVENT_RESTORED, SDL_WINDOWEVENT_SIZE_CHANGED)
+
 class Game:
     def __init__(self) -> None:
         with open("settings.json", "r") as cfg:
@@ -23,7 +33,13 @@ class Game:
         self.window_size: tuple[int, int] = self.config["window"]["width"], self.config["window"]["height"]
         self.controls: dict[str, str] = self.config["controls"]
         self.vsync: bool = self.config["window"]["vsync"]
+        self.frame_cap: int = self.config["window"]["frame cap"]
+        self.pause_in_background: bool = self.config["window"]["pause in background"]
+        self.tick_rate: int = self.config["simulation"]["tick rate"]
+        self.max_catch_up_steps: int = self.config["simulation"]["max catch-up steps"]
         self.fullscreen: bool = self.config["window"]["fullscreen"]
+        self.render_size: tuple[int, int] = self.config["window"]["render width"], self.config["window"]["render height"]
+        self.integer_scaling: bool = self.config["window"]["integer scaling"]
         self.window_flags = 0
         self.renderer_flags = SDL_RENDERER_ACCELERATED
         if self.fullscreen:
@@ -39,54 +55,159 @@ class Game:
             self.window_flags
         )
         self.renderer = SDL_CreateRenderer(self.window, -1, self.renderer_flags)
-        ComSB.init(self.renderer)
+        ComSB.init(self.renderer, self.render_size, self.integer_scaling)
         SDL_SetRenderDrawBlendMode(self.renderer, SDL_BLENDMODE_BLEND)
-        self.window_icon = IMG_Load(b"./assets/player.png")
+        self.window_icon = assets().surface("player.png")
         SDL_SetWindowIcon(self.window, self.window_icon)
         self.scene_manager = SceneManager()
         scenes = {
-            "Intro": Intro(self.window_size, self.renderer),
-            "Main menu": MainMenu(self.window_size, self.renderer),
-            "Credits": Credits(self.window_size, self.renderer),
-            "Map selector": MapSelector(self.window_size, self.renderer),
-            "Loading": Loading(self.window_size, self.renderer),
-            "Platformer": Platformer(self.window_size, self.controls, self.renderer),
-            "Map completed": MapCompleted(self.window_size, self.renderer)
+            "Intro": partial(Intro, self.window_size, self.renderer),
+            "Main menu": partial(MainMenu, self.window_size, self.renderer),
+            "Credits": partial(Credits, self.window_size, self.renderer),
+            "Map selector": partial(MapSelector, self.window_size, self.renderer, self.config["map selector"]),
+            "Loading": partial(Loading, self.window_size, self.renderer, self.config["map loading"]),
+            "Platformer": partial(Platformer, self.window_size, self.controls, self.renderer, self.tick_rate),
+            "Map completed": partial(MapCompleted, self.window_size, self.renderer)
         }
-        self.scene_manager.add_scenes(scenes)
+        self.scene_manager.add_scenes(scenes, EVICT_ON_LEAVE)
+        self.active = False
+        self.minimized = False
+        self.focused = True
+        self.profiler = profiler()
+        self.profiler_overlay = ProfilerOverlay(self.renderer, self.profiler)
+        self.input = Input(self.controls, self.config["controller"])
+
+    def play_replay(self, path: str) -> None:
+        replay = Replay.load(path)
+        replay.check_version()
+        self.scene_manager.switch_scene("Loading", replay)
+
+    def is_idle(self) -> bool:
+        return self.scene_manager.is_idle() and not self.profiler.enabled and not self.input.pending()
+
+    def is_suspended(self) -> bool:
+        return self.minimized or (self.pause_in_background and not self.focused)
+
+    def handle_window_event(self, window_event: int) -> None:
+        if window_event == SDL_WINDOWEVENT_MINIMIZED:
+            self.minimized = True
+        elif window_event in (SDL_WINDOWEVENT_RESTORED, SDL_WINDOWEVENT_SHOWN, SDL_WINDOWEVENT_MAXIMIZED):
+            self.minimized = False
+        elif window_event == SDL_WINDOWEVENT_FOCUS_LOST:
+            self.focused = False
+        elif window_event == SDL_WINDOWEVENT_FOCUS_GAINED:
+            self.focused = True
+        if window_event in INVALIDATING_WINDOW_EVENTS:
+            self.scene_manager.invalidate()
+
+    def handle_event(self, event: SDL_Event) -> None:
+        if event.type == SDL_QUIT:
+            self.active = False
+        elif event.type == SDL_WINDOWEVENT:
+            self.handle_window_event(event.window.event)
+        elif event.type in (SDL_RENDER_TARGETS_RESET, SDL_RENDER_DEVICE_RESET):
+            self.scene_manager.invalidate()
+        elif event.type == SDL_MOUSEBUTTONDOWN:
+            self.scene_manager.on_mouse_button_down(ComSB.mouse_position())
+        elif event.type == SDL_MOUSEMOTION:
+            self.scene_manager.on_mouse_motion(ComSB.mouse_position())
+        elif event.type == SDL_MOUSEBUTTONUP:
+            self.scene_manager.on_mouse_button_up(ComSB.mouse_position())
+        elif event.type == SDL_KEYDOWN and event.key.repeat == 0:
+            key = event.key.keysym.sym
+            if key == SDLK_F3:
+                self.profiler.toggle()
+            elif key == SDLK_F4:
+                self.profiler.dump_csv()
+            else:
+                self.input.on_key(event.key.timestamp, key, True)
+        elif event.type == SDL_KEYUP:
+            self.input.on_key(event.key.timestamp, event.key.keysym.sym, False)
+        elif event.type in CONTROLLER_EVENTS:
+            self.input.on_controller_event(event)
+
+    def wait_while_suspended(self) -> None:
+        event = SDL_Event()
+        while self.active and self.is_suspended():
+            if SDL_WaitEvent(byref(event)):
+                self.handle_event(event)
+
+    @staticmethod
+    def wait_until(deadline: int, frequency: int) -> None:
+        remaining = (deadline - SDL_GetPerformanceCounter()) * 1000 // frequency
+        if remaining > SLEEP_MARGIN_MS:
+            SDL_Delay(remaining - SLEEP_MARGIN_MS)
+        while SDL_GetPerformanceCounter() < deadline:
+            pass
 
     def run(self) -> None:
-        alpha = SDL_GetTicks()
-        active = True
-        while active:
-            beta = SDL_GetTicks()
-            delta_time = (beta - alpha) / 1000
-            alpha = beta
+        frequency = SDL_GetPerformanceFrequency()
+        tick_duration = 1 / self.tick_rate
+        frame_duration = frequency // self.frame_cap if self.frame_cap > 0 else 0
+        accumulator = 0.0
+        alpha = SDL_GetPerformanceCounter()
+        frame_start = alpha
+        self.active = True
+        while self.active:
+            if self.is_suspended():
+                self.wait_while_suspended()
+                self.scene_manager.invalidate()
+                alpha = frame_start = SDL_GetPerformanceCounter()
+                accumulator = 0.0
+                continue
+            self.profiler.end_frame()
+            started = self.profiler.start()
+            if frame_duration:
+                self.wait_until(frame_start + frame_duration, frequency)
+                frame_start = max(frame_start + frame_duration, SDL_GetPerformanceCounter() - frame_duration)
             event = SDL_Event()
+            has_event = self.is_idle() and SDL_WaitEventTimeout(byref(event), IDLE_WAIT_MS)
+            self.profiler.stop(WAIT, started)
+            started = self.profiler.start()
+            if has_event:
+                self.handle_event(event)
             while SDL_PollEvent(byref(event)):
-                if event.type == SDL_QUIT:
-                    active = False
-                elif event.type == SDL_MOUSEBUTTONDOWN:
-                    x, y = c_int(0), c_int(0)
-                    SDL_GetMouseState(byref(x), byref(y))
-                    self.scene_manager.on_mouse_button_down((x, y))
-                elif event.type == SDL_MOUSEBUTTONUP:
-                    x, y = c_int(0), c_int(0)
-                    SDL_GetMouseState(byref(x), byref(y))
-                    self.scene_manager.on_mouse_button_up((x, y))
-                elif event.type == SDL_KEYDOWN and event.key.repeat == 0:
-                    key = event.key.keysym.sym
-                    self.scene_manager.on_key_down(key)
-                elif event.type == SDL_KEYUP:
-                    key = event.key.keysym.sym
-                    self.scene_manager.on_key_up(key)
-            self.scene_manager.update(delta_time)
-            self.scene_manager.draw(self.window, self.renderer)
+                self.handle_event(event)
+            self.profiler.stop(EVENTS, started)
+            beta = SDL_GetPerformanceCounter()
+            now = SDL_GetTicks()
+            accumulator += (beta - alpha) / frequency
+            alpha = beta
+            steps = 0
+            while accumulator >= tick_duration and steps < self.max_catch_up_steps:
+                self.input.dispatch(self.scene_manager, now - int((accumulator - tick_duration) * 1000))
+                self.input.sample_keyboard(self.scene_manager, SDL_GetTicks())
+                self.scene_manager.update(tick_duration)
+                accumulator -= tick_duration
+                steps += 1
+                if self.scene_manager.should_quit:
+                    break
+            if accumulator >= tick_duration:
+                accumulator %= tick_duration
+            if not self.is_idle():
+                self.scene_manager.draw(self.window, self.renderer, accumulator / tick_duration)
+                started = self.profiler.start()
+                if self.profiler.enabled:
+                    SDL_SetRenderTarget(self.renderer, None)
+                    self.profiler_overlay.draw(self.renderer)
+                self.profiler.stop(OVERLAY, started)
+                started = self.profiler.start()
+                SDL_RenderPresent(self.renderer)
+                self.profiler.stop(PRESENT, started)
+                presented = SDL_GetTicks()
+                for timestamp in self.input.take_dispatched():
+                    self.profiler.record_latency(presented - timestamp)
+            else:
+                self.input.take_dispatched()
             if self.scene_manager.should_quit:
-                active = False
+                self.active = False
 
     def quit(self):
+        self.profiler_overlay.destroy()
+        self.input.quit()
+        self.scene_manager.quit()
+        assets().release(self.window_icon)
+        assets().quit()
         SDL_DestroyRenderer(self.renderer)
         SDL_DestroyWindow(self.window)
-        self.scene_manager.quit()
         ComSB.quit()
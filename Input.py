@@ -0,0 +1,110 @@
+from collections import deque
+from sdl2 import *
+from SceneManager import SceneManager
+
+
+ACTIONS = ("left", "right", "jump", "dash")
+CONTROLLER_EVENTS = (
+    SDL_CONTROLLERDEVICEADDED, SDL_CONTROLLERDEVICEREMOVED,
+    SDL_CONTROLLERBUTTONDOWN, SDL_CONTROLLERBUTTONUP, SDL_CONTROLLERAXISMOTION
+)
+
+
+class Input:
+    def __init__(self, controls: dict, controller: dict) -> None:
+        self.poll_keyboard: bool = controls["poll keyboard"]
+        self.action_keys = {name: SDL_GetKeyFromName(controls[name].encode()) for name in ACTIONS}
+        self.scancodes = {key: SDL_GetScancodeFromKey(key) for key in self.action_keys.values()}
+        self.buttons: dict[int, int] = {
+            SDL_GameControllerGetButtonFromString(controller[name].encode()): key
+            for name, key in self.action_keys.items()
+        }
+        self.buttons[SDL_GameControllerGetButtonFromString(controller["back"].encode())] = SDLK_ESCAPE
+        self.dead_zone: int = controller["dead zone"]
+        self.controllers: dict[int, SDL_GameController] = {}
+        self.controller_keys: dict[int, set[int]] = {}
+        self.stick_key: int | None = None
+        self.queue: deque[tuple[int, int, bool]] = deque()
+        self.held: set[int] = set()
+        self.dispatched: list[int] = []
+
+    def on_key(self, timestamp: int, key: int, pressed: bool) -> None:
+        self.queue.append((timestamp, key, pressed))
+
+    def on_controller_event(self, event: SDL_Event) -> None:
+        if event.type == SDL_CONTROLLERDEVICEADDED:
+            controller = SDL_GameControllerOpen(event.cdevice.which)
+            if controller:
+                instance = SDL_JoystickInstanceID(SDL_GameControllerGetJoystick(controller))
+                self.controllers[instance] = controller
+                self.controller_keys[instance] = set()
+        elif event.type == SDL_CONTROLLERDEVICEREMOVED:
+            controller = self.controllers.pop(event.cdevice.which, None)
+            if controller is not None:
+                SDL_GameControllerClose(controller)
+            for key in self.controller_keys.pop(event.cdevice.which, set()):
+                self.on_key(event.cdevice.timestamp, key, False)
+            if self.stick_key is not None:
+                self.on_key(event.cdevice.timestamp, self.stick_key, False)
+                self.stick_key = None
+        elif event.type in (SDL_CONTROLLERBUTTONDOWN, SDL_CONTROLLERBUTTONUP):
+            key = self.buttons.get(event.cbutton.button)
+            if key is not None:
+                pressed = event.type == SDL_CONTROLLERBUTTONDOWN
+                held = self.controller_keys.setdefault(event.cbutton.which, set())
+                if pressed:
+                    held.add(key)
+                else:
+                    held.discard(key)
+                self.on_key(event.cbutton.timestamp, key, pressed)
+        elif event.type == SDL_CONTROLLERAXISMOTION and event.caxis.axis == SDL_CONTROLLER_AXIS_LEFTX:
+            key = None
+            if event.caxis.value < -self.dead_zone:
+                key = self.action_keys["left"]
+            elif event.caxis.value > self.dead_zone:
+                key = self.action_keys["right"]
+            if key != self.stick_key:
+                if self.stick_key is not None:
+                    self.on_key(event.caxis.timestamp, self.stick_key, False)
+                if key is not None:
+                    self.on_key(event.caxis.timestamp, key, True)
+                self.stick_key = key
+
+    def pending(self) -> bool:
+        return len(self.queue) > 0
+
+    def apply(self, scene_manager: SceneManager, timestamp: int, key: int, pressed: bool) -> None:
+        if pressed == (key in self.held):
+            return
+        if pressed:
+            self.held.add(key)
+            scene_manager.on_key_down(key)
+        else:
+            self.held.discard(key)
+            scene_manager.on_key_up(key)
+        self.dispatched.append(timestamp)
+
+    def dispatch(self, scene_manager: SceneManager, until: int) -> None:
+        while self.queue and self.queue[0][0] <= until:
+            self.apply(scene_manager, *self.queue.popleft())
+
+    def sample_keyboard(self, scene_manager: SceneManager, now: int) -> None:
+        if not self.poll_keyboard or self.controllers:
+            return
+        SDL_PumpEvents()
+        state = SDL_GetKeyboardState(None)
+        queued = {key for _, key, _ in self.queue}
+        for key, scancode in self.scancodes.items():
+            if key not in queued:
+                self.apply(scene_manager, now, key, bool(state[scancode]))
+
+    def take_dispatched(self) -> list[int]:
+        dispatched = self.dispatched
+        self.dispatched = []
+        return dispatched
+
+    def quit(self) -> None:
+        for controller in self.controllers.values():
+            SDL_GameControllerClose(controller)
+        self.controllers.clear()
+        self.controller_keys.clear()
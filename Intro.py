@@ -3,7 +3,8 @@ from time import time
 from typing import Any
 from sdl2 import *
 from Scene import Scene
-from useful import load_image_as_texture
+from Assets import assets
+from CommonScreenBuffer import begin, finish
 
 
 def magic_function(x: float) -> float:
@@ -15,7 +16,7 @@ class Intro(Scene):
         self.start_time = time()
         self.window_size: tuple[int, int] = args[0]
         renderer = args[1]
-        self.intro_image = load_image_as_texture(b"./assets/intro.png", renderer)
+        self.intro_image = assets().texture(renderer, "intro.png")
         self.skip = False
         self.magic_value = 0.0
 
@@ -26,14 +27,14 @@ class Intro(Scene):
         self.magic_value = magic_function(delta)
         return None
 
-    def draw(self, window: SDL_Window, renderer: SDL_Renderer) -> None:
-        SDL_SetRenderTarget(renderer, None)
+    def draw(self, window: SDL_Window, renderer: SDL_Renderer, interpolation: float) -> None:
+        begin(renderer)
         SDL_SetRenderDrawColor(renderer, 0, 0, 0, SDL_ALPHA_OPAQUE)
         SDL_RenderClear(renderer)
         alpha = min(255, int(self.magic_value * 255))
         SDL_SetTextureAlphaMod(self.intro_image, alpha)
         SDL_RenderCopy(renderer, self.intro_image, None, None)
-        SDL_RenderPresent(renderer)
+        finish(renderer)
 
     def on_mouse_button_down(self, position: tuple[int, int]) -> None:
         pass
@@ -52,4 +53,4 @@ class Intro(Scene):
         pass
 
     def quit(self) -> None:
-        SDL_DestroyTexture(self.intro_image)
+        assets().release(self.intro_image)
@@ -1,31 +1,55 @@
 from collections.abc import Callable
+from ctypes import byref
+from math import sin
 from typing import Any
 from sdl2 import *
 from Scene import Scene
-from CommonScreenBuffer import screen_buffer
-from useful import load_image_as_texture
+from CommonScreenBuffer import begin, finish
+from MapLoader import MapLoader
+from Replay import Replay
+from Assets import assets
 
 
 class Loading(Scene):
     def __init__(self, *args, **kwargs) -> None:
         self.window_size: tuple[int, int] = args[0]
         renderer = args[1]
-        self.loading = load_image_as_texture(b"./assets/loading.png", renderer)
-        self.has_shown = False
-        self.temp_data: Any = None
+        self.look_ahead: int = args[2]["look-ahead rooms"]
+        self.loading = assets().texture(renderer, "loading.png")
+        self.loader: MapLoader | None = None
+        self.replay: Replay | None = None
+        self.elapsed = 0.0
 
     def update(self, data_setter: Callable[[Any], None], delta_time: float) -> None | str:
-        if not self.has_shown:
-            self.has_shown = True
-            return None
-        else:
-            data_setter(self.temp_data)
+        self.elapsed += delta_time
+        if self.loader is not None and self.loader.error is not None:
+            self.loader.quit()
+            self.loader = None
+            self.replay = None
+            return "Map selector"
+        if self.loader is not None and self.loader.is_room_ready(0):
+            data_setter((self.loader, self.replay))
+            self.loader = None
+            self.replay = None
             return "Platformer"
+        return None
 
-    def draw(self, window: SDL_Window, renderer: SDL_Renderer) -> None:
-        SDL_SetRenderTarget(renderer, None)
+    def draw(self, window: SDL_Window, renderer: SDL_Renderer, interpolation: float) -> None:
+        if self.loader is not None:
+            self.loader.poll(renderer)
+        begin(renderer)
+        SDL_SetRenderDrawColor(renderer, 0, 0, 0, SDL_ALPHA_OPAQUE)
+        SDL_RenderClear(renderer)
         SDL_RenderCopy(renderer, self.loading, None, None)
-        SDL_RenderPresent(renderer)
+        progress = 0.0 if self.loader is None else self.loader.progress()
+        outline = SDL_Rect(660, 900, 600, 24)
+        bar = SDL_Rect(664, 904, int(592 * progress), 16)
+        pulse = int(160 + 95 * sin(self.elapsed * 6))
+        SDL_SetRenderDrawColor(renderer, 255, 255, 255, SDL_ALPHA_OPAQUE)
+        SDL_RenderDrawRect(renderer, byref(outline))
+        SDL_SetRenderDrawColor(renderer, pulse, pulse, pulse, SDL_ALPHA_OPAQUE)
+        SDL_RenderFillRect(renderer, byref(bar))
+        finish(renderer)
 
     def on_mouse_button_down(self, position: tuple[int, int]) -> None:
         pass
@@ -40,8 +64,12 @@ class Loading(Scene):
         pass
 
     def on_enter(self, data: Any) -> None:
-        self.temp_data = data
-        self.has_shown = False
+        self.replay = data if isinstance(data, Replay) else None
+        map_name = self.replay.map_name if self.replay is not None else str(data)
+        self.loader = MapLoader(map_name, self.look_ahead)
+        self.elapsed = 0.0
 
     def quit(self) -> None:
-        SDL_DestroyTexture(self.loading)
\ No newline at end of file
+        assets().release(self.loading)
+        if self.loader is not None:
+            self.loader.quit()
@@ -4,34 +4,33 @@ from typing import Any
 from sdl2 import *
 from Button import Button
 from Scene import Scene
-from CommonScreenBuffer import screen_buffer
-from useful import load_image_as_texture
+from UI import UI
+from Assets import assets
 
 
 class MainMenu(Scene):
     def __init__(self, *args, **kwargs) -> None:
         self.window_size: tuple[int, int] = args[0]
         renderer = args[1]
-        self.cool_title = load_image_as_texture(b"./assets/title.png", renderer)
-        self.start_button = Button(renderer, "start", (-1, 500), self.window_size)
-        self.settings_button = Button(renderer, "settings", (-1, 560), self.window_size)
-        self.credits_button = Button(renderer, "credits", (-1, 620), self.window_size)
-        self.exit_button = Button(renderer, "exit", (-1, 680), self.window_size)
+        self.cool_title = assets().texture(renderer, "title.png")
+        self.start_button = Button(renderer, "start", (-1, 500))
+        self.settings_button = Button(renderer, "settings", (-1, 560))
+        self.credits_button = Button(renderer, "credits", (-1, 620))
+        self.exit_button = Button(renderer, "exit", (-1, 680))
+        self.ui = UI([self.start_button, self.settings_button, self.credits_button, self.exit_button])
         self.should_go_next: str | None = None
 
     def update(self, data_setter: Callable[[Any], None], delta_time: float) -> None | str:
-        self.exit_button.update()
-        self.credits_button.update()
-        self.start_button.update()
-        self.settings_button.update()
         if self.should_go_next is not None:
             tmp = self.should_go_next
             self.should_go_next = None
             return tmp
         return None
 
-    def draw(self, window: SDL_Window, renderer: SDL_Renderer) -> None:
-        SDL_SetRenderTarget(renderer, screen_buffer())
+    def draw(self, window: SDL_Window, renderer: SDL_Renderer, interpolation: float) -> None:
+        self.ui.present(renderer, self.compose)
+
+    def compose(self, renderer: SDL_Renderer) -> None:
         SDL_SetRenderDrawColor(renderer, 0, 0, 0, SDL_ALPHA_OPAQUE)
         SDL_RenderClear(renderer)
         self.exit_button.draw(renderer)
@@ -40,9 +39,6 @@ class MainMenu(Scene):
         self.settings_button.draw(renderer)
         dst = SDL_Rect(672, 100, 576, 324)
         SDL_RenderCopy(renderer, self.cool_title, None, byref(dst))
-        SDL_SetRenderTarget(renderer, None)
-        SDL_RenderCopy(renderer, screen_buffer(), None, None)
-        SDL_RenderPresent(renderer)
 
     def on_mouse_button_down(self, position: tuple[int, int]) -> None:
         if self.exit_button.hovering:
@@ -54,6 +50,15 @@ class MainMenu(Scene):
         elif self.start_button.hovering:
             self.should_go_next = "Map selector"
 
+    def on_mouse_motion(self, position: tuple[int, int]) -> None:
+        self.ui.on_mouse_motion(position)
+
+    def is_idle(self) -> bool:
+        return self.should_go_next is None and self.ui.is_idle()
+
+    def invalidate(self) -> None:
+        self.ui.invalidate()
+
     def on_mouse_button_up(self, position: tuple[int, int]) -> None:
         pass
 
@@ -64,10 +69,10 @@ class MainMenu(Scene):
         pass
 
     def on_enter(self, data: Any) -> None:
-        pass
+        self.ui.refresh()
 
     def quit(self) -> None:
-        SDL_DestroyTexture(self.cool_title)
+        assets().release(self.cool_title)
         self.start_button.destroy()
         self.settings_button.destroy()
         self.credits_button.destroy()
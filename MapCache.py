@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+from mmap import mmap, ACCESS_READ
+from os import fstat, replace, getpid
+from pathlib import Path
+from struct import Struct, error as StructError
+import numpy as np
+from sdl2 import *
+from sdl2.sdlimage import *
+from CollisionGrid import CollisionGrid
+from MapParser import classify_room, build_specials, SPECIAL_CELL
+from RoomSpecials import RoomSpecials
+from useful import rgb24_pixels
+
+
+MAPS_FOLDER = Path.cwd() / "maps"
+CACHE_FOLDER = Path.cwd() / "cache" / "maps"
+
+MAGIC = b"NPRM"
+VERSION = 1
+HEADER = Struct("<4sHHHqQ16sI")
+
+
+def cache_path(map_name: str, room: int, cache_folder: Path = CACHE_FOLDER) -> Path:
+    return cache_folder / map_name / f"room{room}.bin"
+
+
+def room_count(map_name: str, maps_folder: Path = MAPS_FOLDER) -> int:
+    return len(list((maps_folder / map_name).glob("obj*.png")))
+
+
+def source_digest(source: Path) -> bytes:
+    return blake2b(source.read_bytes(), digest_size=16).digest()
+
+
+def decode_room(source: Path) -> tuple[CollisionGrid, np.ndarray]:
+    obj = IMG_Load(str(source).encode())
+    if not obj:
+        raise FileNotFoundError(f"Could not load {source}: {IMG_GetError().decode()}")
+    normal = SDL_ConvertSurfaceFormat(obj, SDL_PIXELFORMAT_RGB24, 0)
+    SDL_FreeSurface(obj)
+    walls, table = classify_room(rgb24_pixels(normal))
+    SDL_FreeSurface(normal)
+    return walls, table
+
+
+def read_header(path: Path) -> tuple | None:
+    try:
+        with open(path, "rb") as file:
+            header = HEADER.unpack(file.read(HEADER.size))
+    except (OSError, ValueError, StructError):
+        return None
+    if header[0] != MAGIC or header[1] != VERSION:
+        return None
+    return header
+
+
+def read_room(path: Path) -> tuple[CollisionGrid, np.ndarray] | None:
+    with open(path, "rb") as file:
+        _, _, width, height, _, _, _, count = HEADER.unpack(file.read(HEADER.size))
+        if fstat(file.fileno()).st_size < HEADER.size + width * height + count * SPECIAL_CELL.itemsize:
+            return None
+        with mmap(file.fileno(), 0, access=ACCESS_READ) as data:
+            cells = bytearray(data[HEADER.size:HEADER.size + width * height])
+            table = np.frombuffer(data, dtype=SPECIAL_CELL, count=count, offset=HEADER.size + width * height).copy()
+    return CollisionGrid(width, height, cells), table
+
+
+def write_room(path: Path, source: Path, digest: bytes, walls: CollisionGrid, table: np.ndarray) -> None:
+    stat = source.stat()
+    header = HEADER.pack(MAGIC, VERSION, walls.width, walls.height, stat.st_mtime_ns, stat.st_size, digest, len(table))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(f".{getpid()}.tmp")
+    with open(temporary, "wb") as file:
+        file.write(header)
+        file.write(walls.cells)
+        file.write(table.tobytes())
+    replace(temporary, path)
+
+
+def compile_room(
+    map_name: str, room: int, maps_folder: Path = MAPS_FOLDER, cache_folder: Path = CACHE_FOLDER
+) -> tuple[CollisionGrid, np.ndarray]:
+    source = maps_folder / map_name / f"obj{room}.png"
+    path = cache_path(map_name, room, cache_folder)
+    stat = source.stat()
+    header = read_header(path)
+    if header is not None and header[4] == stat.st_mtime_ns and header[5] == stat.st_size:
+        cached = read_room(path)
+        if cached is not None:
+            return cached
+    digest = source_digest(source)
+    cached = read_room(path) if header is not None and header[6] == digest else None
+    walls, table = cached if cached is not None else decode_room(source)
+    write_room(path, source, digest, walls, table)
+    return walls, table
+
+
+def load_room(
+    map_name: str, room: int, maps_folder: Path = MAPS_FOLDER, cache_folder: Path = CACHE_FOLDER
+) -> tuple[CollisionGrid, RoomSpecials]:
+    walls, table = compile_room(map_name, room, maps_folder, cache_folder)
+    return walls, build_specials(table)
+
+
+def compile_map(map_name: str) -> int:
+    rooms = room_count(map_name)
+    for room in range(1, rooms + 1):
+        compile_room(map_name, room)
+    return rooms
+
+
+def compile_all_maps(workers: int | None = None) -> None:
+    names = sorted(x.name for x in MAPS_FOLDER.glob("*") if x.is_dir())
+    with ProcessPoolExecutor(workers) as pool:
+        for name, rooms in zip(names, pool.map(compile_map, names)):
+            print(f"{name}: {rooms} rooms")
+
+
+if __name__ == "__main__":
+    compile_all_maps()
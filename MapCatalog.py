@@ -0,0 +1,116 @@
+from ctypes import CDLL, get_errno
+from ctypes.util import find_library
+from os import close, read, scandir, strerror
+from pathlib import Path
+from struct import Struct
+import sys
+
+
+IN_ATTRIB = 0x4
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_IGNORED = 0x8000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+EVENT = Struct("iIII")
+
+
+class Inotify:
+    def __init__(self) -> None:
+        self.libc = CDLL(find_library("c"), use_errno=True)
+        self.fd: int = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(get_errno(), strerror(get_errno()))
+
+    def watch(self, path: Path) -> int:
+        descriptor = self.libc.inotify_add_watch(self.fd, str(path).encode(), WATCH_MASK)
+        if descriptor < 0:
+            raise OSError(get_errno(), strerror(get_errno()), str(path))
+        return descriptor
+
+    def events(self) -> list[tuple[int, int]]:
+        events = []
+        while True:
+            try:
+                data = read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                descriptor, mask, _, length = EVENT.unpack_from(data, offset)
+                events.append((descriptor, mask))
+                offset += EVENT.size + length
+
+    def close(self) -> None:
+        close(self.fd)
+
+
+class MapCatalog:
+    def __init__(self, folder: Path) -> None:
+        self.folder = folder
+        self.maps: dict[str, int] = {}
+        self.names: list[str] = []
+        self.dirty = True
+        self.inotify: Inotify | None = None
+        self.root_watch = -1
+        if sys.platform.startswith("linux"):
+            try:
+                self.inotify = Inotify()
+                self.root_watch = self.inotify.watch(folder)
+            except OSError:
+                self.stop_watching()
+
+    def stop_watching(self) -> None:
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
+
+    def poll_events(self) -> None:
+        if self.inotify is None:
+            self.dirty = True
+            return
+        for descriptor, mask in self.inotify.events():
+            self.dirty = True
+            if descriptor == self.root_watch and mask & IN_IGNORED:
+                self.stop_watching()
+                return
+
+    def scan(self) -> dict[str, int]:
+        found = {}
+        try:
+            with scandir(self.folder) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        found[entry.name] = entry.stat().st_mtime_ns
+        except FileNotFoundError:
+            pass
+        return found
+
+    def refresh(self) -> tuple[list[str], list[str], list[str]]:
+        self.poll_events()
+        if not self.dirty:
+            return [], [], []
+        self.dirty = False
+        found = self.scan()
+        added = [name for name in found if name not in self.maps]
+        removed = [name for name in self.maps if name not in found]
+        changed = [name for name in found if name in self.maps and found[name] != self.maps[name]]
+        if self.inotify is not None:
+            for name in added + changed:
+                try:
+                    self.inotify.watch(self.folder / name)
+                except OSError:
+                    self.dirty = True
+        self.maps = found
+        self.names = sorted(found)
+        return added, removed, changed
+
+    def quit(self) -> None:
+        self.stop_watching()
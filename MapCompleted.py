@@ -5,9 +5,10 @@ from sdl2 import *
 from sdl2.sdlttf import *
 from sdl2.sdlgfx import *
 from Button import Button
-from CommonScreenBuffer import screen_buffer
+from UI import UI
 from Scene import Scene
-from useful import load_image_as_texture, render_utf8_solid_as_texture
+from Assets import assets
+from useful import render_utf8_solid_as_texture
 
 WHITE = SDL_Color(255, 255, 255, SDL_ALPHA_OPAQUE)
 
@@ -16,8 +17,8 @@ class MapCompleted(Scene):
         self.window_size: tuple[int, int] = args[0]
         renderer = args[1]
         self.renderer = args[1]
-        self.completed_img = load_image_as_texture(b"./assets/completed.png", renderer)
-        self.font = TTF_OpenFont(b"./assets/TinyUnicode.ttf", 64)
+        self.completed_img = assets().texture(renderer, "completed.png")
+        self.font = assets().font("TinyUnicode.ttf", 64)
         self.map_completed_img: SDL_Texture | None = None
         self.respawns: SDL_Texture | None = None
         self.time_elapsed_img: SDL_Texture | None = None
@@ -25,11 +26,11 @@ class MapCompleted(Scene):
         self.time_elapsed = 0.0
         self.map_completed = ""
         self.fade_timer = 1.0
-        self.back_button = Button(renderer, "back", (-1, 700), self.window_size)
+        self.back_button = Button(renderer, "back", (-1, 700))
+        self.ui = UI([self.back_button])
         self.go_back = False
 
     def update(self, data_setter: Callable[[Any], None], delta_time: float) -> None | str:
-        self.back_button.update()
         self.fade_timer -= delta_time
         if self.go_back:
             self.go_back = False
@@ -37,8 +38,10 @@ class MapCompleted(Scene):
             return "Main menu"
         return None
 
-    def draw(self, window: SDL_Window, renderer: SDL_Renderer) -> None:
-        SDL_SetRenderTarget(renderer, screen_buffer())
+    def draw(self, window: SDL_Window, renderer: SDL_Renderer, interpolation: float) -> None:
+        self.ui.present(renderer, self.compose)
+
+    def compose(self, renderer: SDL_Renderer) -> None:
         SDL_SetRenderDrawColor(renderer, 0, 0, 0, SDL_ALPHA_OPAQUE)
         SDL_RenderClear(renderer)
         w1, h1 = c_int(0), c_int(0)
@@ -58,16 +61,21 @@ class MapCompleted(Scene):
         SDL_RenderCopy(renderer, self.respawns, None, dst3)
         SDL_RenderCopy(renderer, self.time_elapsed_img, None, dst4)
         self.back_button.draw(renderer)
-        SDL_SetRenderTarget(renderer, None)
-        SDL_RenderCopy(renderer, screen_buffer(), None, None)
-        SDL_RenderPresent(renderer)
-        return None
 
     def on_mouse_button_down(self, position: tuple[int, int]) -> None:
         if self.back_button.hovering:
             self.go_back = True
         return None
 
+    def on_mouse_motion(self, position: tuple[int, int]) -> None:
+        self.ui.on_mouse_motion(position)
+
+    def is_idle(self) -> bool:
+        return not self.go_back and self.ui.is_idle()
+
+    def invalidate(self) -> None:
+        self.ui.invalidate()
+
     def on_mouse_button_up(self, position: tuple[int, int]) -> None:
         pass
 
@@ -99,10 +107,11 @@ class MapCompleted(Scene):
         self.map_completed_img = render_utf8_solid_as_texture(
             self.renderer, self.font, f"{self.map_completed} completed".encode(), WHITE
         )
+        self.ui.refresh()
 
     def quit(self) -> None:
-        TTF_CloseFont(self.font)
-        SDL_DestroyTexture(self.completed_img)
+        assets().release(self.font)
+        assets().release(self.completed_img)
         if self.map_completed_img is not None:
             SDL_DestroyTexture(self.map_completed_img)
         if self.respawns is not None:
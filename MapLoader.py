@@ -0,0 +1,170 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from ctypes import byref
+from pathlib import Path
+from threading import Lock
+from sdl2 import *
+from sdl2.sdlimage import *
+from Camera import Camera
+from CollisionGrid import CollisionGrid, CELL_SIZE
+from CommonScreenBuffer import WIDTH, HEIGHT
+from MapCache import load_room, room_count, MAPS_FOLDER, CACHE_FOLDER
+from RoomBackground import RoomBackground
+from RoomSpecials import RoomSpecials
+from SpecialObject import SPECIAL_TYPES
+
+
+class MapLoader:
+    def __init__(
+        self, map_name: str, look_ahead: int = 1, workers: int | None = None,
+        maps_folder: Path = MAPS_FOLDER, cache_folder: Path = CACHE_FOLDER
+    ) -> None:
+        self.map_name = map_name
+        self.folder: Path = maps_folder / map_name
+        self.maps_folder = maps_folder
+        self.cache_folder = cache_folder
+        self.room_count = room_count(map_name, maps_folder)
+        self.look_ahead = look_ahead
+        self.current_room = 0
+        self.pinned = self.window()
+        self.walls: list[CollisionGrid | None] = [None] * self.room_count
+        self.specials: list[RoomSpecials | None] = [None] * self.room_count
+        self.backgrounds: list[RoomBackground | None] = [None] * self.room_count
+        self.views: list[tuple[int, int, int, int]] = [(0, 0, WIDTH, HEIGHT)] * self.room_count
+        self.spawn_views: list[tuple[int, int, int, int]] = [(0, 0, WIDTH, HEIGHT)] * self.room_count
+        self.static_sprites = {
+            kind.name: IMG_Load(f"./assets/{kind.baked_sprite}".encode())
+            for kind in SPECIAL_TYPES.values() if kind.baked_sprite is not None
+        }
+        self.error: Exception | None = None
+        if self.room_count == 0:
+            self.error = FileNotFoundError(f"{map_name} has no rooms")
+        self.bake_lock = Lock()
+        self.pool = ThreadPoolExecutor(workers)
+        self.futures: list[Future] = []
+        self.background_futures: dict[int, Future] = {}
+        for room in range(self.room_count):
+            self.futures.append(self.pool.submit(self.decode_room, room))
+            if self.is_resident(room):
+                self.request_background(room)
+
+    def window(self) -> range:
+        return range(self.current_room, min(self.current_room + self.look_ahead + 1, self.room_count))
+
+    def is_resident(self, room: int) -> bool:
+        return room in self.pinned or room in self.window()
+
+    def decode_room(self, room: int) -> None:
+        self.walls[room], self.specials[room] = load_room(self.map_name, room + 1, self.maps_folder, self.cache_folder)
+
+    def decode_background(self, room: int) -> RoomBackground:
+        self.futures[room].result()
+        bg = IMG_Load(str(self.folder / f"bg{room + 1}.png").encode())
+        if not bg:
+            raise FileNotFoundError(f"Could not load room {room + 1} of {self.map_name}: {IMG_GetError().decode()}")
+        surface = SDL_ConvertSurfaceFormat(bg, SDL_PIXELFORMAT_ARGB8888, 0)
+        SDL_FreeSurface(bg)
+        self.bake_static_objects(surface, self.specials[room])
+        background = RoomBackground(surface)
+        SDL_FreeSurface(surface)
+        return background
+
+    def bake_static_objects(self, surface: SDL_Surface, specials: RoomSpecials) -> None:
+        with self.bake_lock:
+            for name, sprite in self.static_sprites.items():
+                if not sprite:
+                    continue
+                for i in specials.indices(name):
+                    dst = SDL_Rect(specials.x[i], specials.y[i], 24, 24)
+                    SDL_BlitScaled(sprite, None, surface, byref(dst))
+
+    def spawn_view(self, room: int) -> tuple[int, int, int, int]:
+        specials, walls = self.specials[room], self.walls[room]
+        spawn = specials.spawn
+        x, y = (specials.x[spawn], specials.y[spawn]) if spawn >= 0 else (0, 0)
+        camera = Camera(WIDTH, HEIGHT)
+        camera.follow(x, y, walls.width * CELL_SIZE, walls.height * CELL_SIZE)
+        return camera.view()
+
+    def set_view(self, room: int, view: tuple[int, int, int, int]) -> None:
+        self.views[room] = view
+
+    def request_background(self, room: int) -> None:
+        if self.backgrounds[room] is None and room not in self.background_futures:
+            self.background_futures[room] = self.pool.submit(self.decode_background, room)
+
+    def set_current_room(self, room: int) -> None:
+        if room == self.current_room:
+            return
+        self.views[self.current_room] = self.spawn_views[self.current_room]
+        self.current_room = room
+        loaded = [i for i, background in enumerate(self.backgrounds) if background is not None]
+        for i in loaded + list(self.background_futures):
+            if not self.is_resident(i):
+                self.evict(i)
+        for i in self.window():
+            self.request_background(i)
+
+    def evict(self, room: int) -> None:
+        future = self.background_futures.get(room)
+        if future is not None and future.cancel():
+            del self.background_futures[room]
+        if self.backgrounds[room] is not None:
+            self.backgrounds[room].destroy()
+            self.backgrounds[room] = None
+
+    def poll(self, renderer: SDL_Renderer, budget: int = 1) -> None:
+        for room in sorted(self.background_futures):
+            future = self.background_futures[room]
+            if not future.done():
+                continue
+            del self.background_futures[room]
+            try:
+                background = future.result()
+            except Exception as error:
+                self.error = error
+                continue
+            if self.is_resident(room):
+                self.backgrounds[room] = background
+                self.spawn_views[room] = self.views[room] = self.spawn_view(room)
+            else:
+                background.destroy()
+        rooms = sorted(set(self.window()) | set(self.pinned), key=lambda room: (room != self.current_room, room))
+        for room in rooms:
+            background = self.backgrounds[room]
+            if background is None:
+                continue
+            views = [self.views[room]]
+            if room == self.current_room and room in self.pinned:
+                views.append(self.spawn_views[room])
+            budget = background.upload(renderer, views, budget)
+
+    def is_room_ready(self, room: int) -> bool:
+        background = self.backgrounds[room]
+        return background is not None and background.is_ready(self.views[room])
+
+    def is_settled(self) -> bool:
+        return (
+            all(future.done() for future in self.futures) and not self.background_futures
+            and all(self.is_room_ready(room) for room in self.window())
+        )
+
+    def progress(self) -> float:
+        window = self.window()
+        if len(window) == 0:
+            return 1.0
+        return sum(self.is_room_ready(room) for room in window) / len(window)
+
+    def quit(self) -> None:
+        for future in self.futures + list(self.background_futures.values()):
+            future.cancel()
+        self.pool.shutdown(wait=True)
+        for future in self.background_futures.values():
+            if not future.cancelled() and future.exception() is None:
+                future.result().destroy()
+        self.background_futures.clear()
+        for kind in list(self.static_sprites):
+            SDL_FreeSurface(self.static_sprites.pop(kind))
+        for room in range(self.room_count):
+            if self.backgrounds[room] is not None:
+                self.backgrounds[room].destroy()
+                self.backgrounds[room] = None
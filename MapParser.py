@@ -0,0 +1,36 @@
+import numpy as np
+from CollisionGrid import CollisionGrid, SOLID, DEADLY
+from RoomSpecials import RoomSpecials
+from SpecialObject import SPECIAL_COLORS, pack_color
+
+
+WALL_COLORS: dict[int, int] = {
+    pack_color(255, 255, 255): SOLID,
+    pack_color(255, 0, 0): DEADLY
+}
+
+SPECIAL_CELL = np.dtype([("color", "<u4"), ("x", "<u2"), ("y", "<u2")])
+
+
+def classify_room(pixels: np.ndarray) -> tuple[CollisionGrid, np.ndarray]:
+    colors = pixels[..., 0].astype(np.uint32) << 16 | pixels[..., 1].astype(np.uint32) << 8 | pixels[..., 2]
+    height, width = colors.shape
+    cells = np.zeros((height, width), dtype=np.uint8)
+    for color, kind in WALL_COLORS.items():
+        cells[colors == color] = kind
+    walls = CollisionGrid(width, height, bytearray(cells.tobytes()))
+    columns, rows = np.nonzero(np.isin(colors.T, list(SPECIAL_COLORS)))
+    table = np.zeros(len(columns), dtype=SPECIAL_CELL)
+    table["color"] = colors[rows, columns]
+    table["x"] = columns
+    table["y"] = rows
+    return walls, table
+
+
+def build_specials(table: np.ndarray) -> RoomSpecials:
+    return RoomSpecials(table)
+
+
+def parse_room(pixels: np.ndarray) -> tuple[CollisionGrid, RoomSpecials]:
+    walls, table = classify_room(pixels)
+    return walls, build_specials(table)
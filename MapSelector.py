@@ -4,10 +4,12 @@ from pathlib import Path
 from typing import Any
 from sdl2 import *
 from sdl2.sdlttf import *
-from sdl2.sdlimage import *
-from useful import load_image_as_texture
+from Assets import assets
+from useful import render_utf8_solid_as_texture
+from CoverCache import CoverCache
+from MapCatalog import MapCatalog
 from Button import Button
-from CommonScreenBuffer import screen_buffer
+from UI import UI
 from Scene import Scene
 
 
@@ -19,62 +21,62 @@ class MapSelector(Scene):
     def __init__(self, *args, **kwargs) -> None:
         self.window_size: tuple[int, int] = args[0]
         self.renderer = args[1]
-        self.start_button = Button(self.renderer, "start", (-1, 800), self.window_size)
-        self.previous_map_button = Button(self.renderer, "selector2", (1920 // 2 - 300, 500), self.window_size)
-        self.next_map_button = Button(self.renderer, "selector", (1920 // 2 + 300 - 51, 500), self.window_size)
-        self.error_map_cover = load_image_as_texture(b"./assets/map_cover_error.png", self.renderer)
-        self.font = TTF_OpenFont(b"./assets/TinyUnicode.ttf", 64)
+        settings: dict = args[2]
+        self.start_button = Button(self.renderer, "start", (-1, 800))
+        self.previous_map_button = Button(self.renderer, "selector2", (1920 // 2 - 300, 500))
+        self.next_map_button = Button(self.renderer, "selector", (1920 // 2 + 300 - 51, 500))
+        self.error_map_cover = assets().texture(self.renderer, "map_cover_error.png")
+        self.font = assets().font("TinyUnicode.ttf", 64)
         no_maps_found_surf = TTF_RenderUTF8_Solid(self.font, b"No maps found in the maps folder :(", WHITE)
         self.no_maps_found = SDL_CreateTextureFromSurface(self.renderer, no_maps_found_surf)
         SDL_FreeSurface(no_maps_found_surf)
-        self.title_thing = load_image_as_texture(b"./assets/select_map.png", self.renderer)
-        self.back_button = Button(self.renderer, "back", (-1, 860), self.window_size)
-        self.refresh_button = Button(self.renderer, "refresh", (-1, 920), self.window_size)
+        self.title_thing = assets().texture(self.renderer, "select_map.png")
+        self.back_button = Button(self.renderer, "back", (-1, 860))
+        self.refresh_button = Button(self.renderer, "refresh", (-1, 920))
+        self.ui = UI([
+            self.start_button, self.previous_map_button, self.next_map_button, self.back_button, self.refresh_button
+        ])
         self.should_go_next: str | None = None
         self.map_to_be_played: str | None = None
         self.selected = 0
         self.maps_folder = Path.cwd() / "maps"
-        self.maps_paths: list[Path] = []
+        self.catalog = MapCatalog(self.maps_folder)
         self.maps_names: list[str] = []
-        self.maps_covers_paths: list[Path] = []
-        self.maps_covers_loaded: list[SDL_Texture | None] = []
-        self.maps_names_rendered: list[SDL_Texture] = []
+        self.cover_prefetch: int = settings["cover prefetch"]
+        self.covers = CoverCache(self.renderer, max(settings["cover cache size"], 2 * self.cover_prefetch + 1))
+        self.maps_names_rendered: dict[str, SDL_Texture] = {}
         self.maps_count = 0
-        self.refresh_maps(self.renderer)
-
-    def refresh_maps(self, renderer) -> None:
-        self.maps_paths = [x for x in self.maps_folder.glob("*") if x.is_dir()]
-        self.maps_names = [x.name for x in self.maps_paths]
-        self.maps_covers_paths: list[Path] = [x / "cover.png" for x in self.maps_paths]
-        for i in range(len(self.maps_covers_loaded)):
-            SDL_DestroyTexture(self.maps_covers_loaded.pop())
-        for map_cover_path in self.maps_covers_paths:
-            if map_cover_path.exists():
-                raw = IMG_Load(str(map_cover_path).encode())
-                raw_tex = SDL_CreateTextureFromSurface(renderer, raw)
-                buf_tex = SDL_CreateTexture(renderer, SDL_PIXELFORMAT_RGB24, SDL_TEXTUREACCESS_TARGET, 384, 216)
-                SDL_SetRenderTarget(renderer, buf_tex)
-                SDL_RenderCopy(renderer, raw_tex, None, None)
-                SDL_FreeSurface(raw)
-                SDL_DestroyTexture(raw_tex)
-                self.maps_covers_loaded.append(buf_tex)
-            else:
-                self.maps_covers_loaded.append(None)
-        maps_names_rendered_surfs = [TTF_RenderUTF8_Solid(self.font, name.encode(), WHITE) for name in self.maps_names]
-        self.maps_names_rendered = [
-            SDL_CreateTextureFromSurface(renderer, i) for i in maps_names_rendered_surfs
-        ]
-        for _ in range(len(maps_names_rendered_surfs)):
-            SDL_FreeSurface(maps_names_rendered_surfs.pop())
-        self.maps_count = len(self.maps_paths)
-        self.selected = 0
+        self.refresh_maps()
+
+    def refresh_maps(self) -> None:
+        added, removed, changed = self.catalog.refresh()
+        if not (added or removed or changed):
+            return
+        for name in removed:
+            SDL_DestroyTexture(self.maps_names_rendered.pop(name))
+        for name in removed + changed:
+            self.covers.discard(name)
+        for name in added:
+            self.maps_names_rendered[name] = render_utf8_solid_as_texture(self.renderer, self.font, name.encode(), WHITE)
+        selected_name = self.maps_names[self.selected] if self.selected < self.maps_count else None
+        self.maps_names = self.catalog.names
+        self.maps_count = len(self.maps_names)
+        if selected_name in self.maps_names:
+            self.selected = self.maps_names.index(selected_name)
+        else:
+            self.selected = max(min(self.selected, self.maps_count - 1), 0)
+        self.request_covers()
+        self.ui.invalidate()
+
+    def request_covers(self) -> None:
+        for distance in range(self.cover_prefetch + 1):
+            for i in {self.selected - distance, self.selected + distance}:
+                if 0 <= i < self.maps_count:
+                    self.covers.request(self.maps_folder / self.maps_names[i])
 
     def update(self, data_setter: Callable[[Any], None], delta_time: float) -> None | str:
-        self.back_button.update()
-        self.next_map_button.update()
-        self.previous_map_button.update()
-        self.start_button.update()
-        self.refresh_button.update()
+        if self.covers.poll():
+            self.ui.invalidate()
         if self.should_go_next is not None:
             tmp = self.should_go_next
             self.should_go_next = None
@@ -85,8 +87,10 @@ class MapSelector(Scene):
             return "Loading"
         return None
 
-    def draw(self, window: SDL_Window, renderer: SDL_Renderer) -> None:
-        SDL_SetRenderTarget(renderer, screen_buffer())
+    def draw(self, window: SDL_Window, renderer: SDL_Renderer, interpolation: float) -> None:
+        self.ui.present(renderer, self.compose)
+
+    def compose(self, renderer: SDL_Renderer) -> None:
         SDL_SetRenderDrawColor(renderer, 0, 0, 0, SDL_ALPHA_OPAQUE)
         SDL_RenderClear(renderer)
         dst = SDL_Rect(672, 0,576, 324)
@@ -97,13 +101,13 @@ class MapSelector(Scene):
             self.previous_map_button.draw(renderer)
             self.next_map_button.draw(renderer)
             self.start_button.draw(renderer)
-            cover = self.maps_covers_loaded[self.selected]
+            cover = self.covers.cover(self.maps_names[self.selected])
             dst_01 = SDL_Rect(768, 400, 384, 216)
-            if cover is None:
+            if cover is not None:
+                SDL_RenderCopy(renderer, cover, None, dst_01)
+            elif not self.covers.is_pending(self.maps_names[self.selected]):
                 SDL_RenderCopy(renderer, self.error_map_cover, None, dst_01)
-            else:
-                SDL_RenderCopy(renderer, self.maps_covers_loaded[self.selected], None, dst_01)
-            selected_rendered_name = self.maps_names_rendered[self.selected]
+            selected_rendered_name = self.maps_names_rendered[self.maps_names[self.selected]]
             w, h = c_int(0), c_int(0)
             SDL_QueryTexture(selected_rendered_name, None, None, byref(w), byref(h))
             x = c_int(1920//2-w.value//2)
@@ -114,27 +118,40 @@ class MapSelector(Scene):
             SDL_QueryTexture(self.no_maps_found, None, None, byref(w), byref(h))
             dst_03 = SDL_Rect(500, 500, w, h)
             SDL_RenderCopy(renderer, self.no_maps_found, None, byref(dst_03))
-        SDL_SetRenderTarget(renderer, None)
-        SDL_RenderCopy(renderer, screen_buffer(), None, None)
-        SDL_RenderPresent(renderer)
 
     def on_mouse_button_down(self, position: tuple[int, int]) -> None:
         if self.back_button.hovering:
             self.should_go_next = "Main menu"
         elif self.refresh_button.hovering:
-            self.refresh_maps(self.renderer)
+            self.refresh_maps()
         elif self.maps_count == 0:
             pass
         elif self.previous_map_button.hovering and self.selected != 0:
             self.selected -= 1
+            self.request_covers()
+            self.ui.invalidate()
         elif self.next_map_button.hovering and self.selected != self.maps_count - 1:
             self.selected += 1
+            self.request_covers()
+            self.ui.invalidate()
         elif self.start_button.hovering:
             self.map_to_be_played = self.maps_names[self.selected]
 
     def on_key_down(self, key: int) -> None:
         pass
 
+    def on_mouse_motion(self, position: tuple[int, int]) -> None:
+        self.ui.on_mouse_motion(position)
+
+    def is_idle(self) -> bool:
+        return (
+            self.should_go_next is None and self.map_to_be_played is None
+            and not self.covers.is_pending() and self.ui.is_idle()
+        )
+
+    def invalidate(self) -> None:
+        self.ui.invalidate()
+
     def on_mouse_button_up(self, position: tuple[int, int]) -> None:
         pass
 
@@ -142,7 +159,8 @@ class MapSelector(Scene):
         pass
 
     def on_enter(self, data: Any) -> None:
-        self.refresh_maps(self.renderer)
+        self.refresh_maps()
+        self.ui.refresh()
 
     def quit(self) -> None:
         self.start_button.destroy()
@@ -150,10 +168,12 @@ class MapSelector(Scene):
         self.previous_map_button.destroy()
         self.back_button.destroy()
         self.refresh_button.destroy()
-        TTF_CloseFont(self.font)
-        SDL_DestroyTexture(self.error_map_cover)
+        assets().release(self.font)
+        assets().release(self.error_map_cover)
+        assets().release(self.title_thing)
         SDL_DestroyTexture(self.no_maps_found)
-        for _ in range(len(self.maps_covers_loaded)):
-            SDL_DestroyTexture(self.maps_covers_loaded.pop())
-        for _ in range(len(self.maps_names_rendered)):
-            SDL_DestroyTexture(self.maps_names_rendered.pop())
+        self.covers.quit()
+        for texture in self.maps_names_rendered.values():
+            SDL_DestroyTexture(texture)
+        self.maps_names_rendered.clear()
+        self.catalog.quit()
@@ -0,0 +1,104 @@
+from ctypes import c_uint8
+import numpy as np
+from sdl2 import *
+from SpriteAtlas import SpriteAtlas
+from SpriteBatch import SpriteBatch
+
+
+PARTICLE_SPRITE_SIZE = 16
+PARTICLE_LIFETIME = 0.5
+BURST_SIZE = 24
+BURST_SPEED = 255
+PARTICLE_SIZES = (8, 12, 16)
+
+
+def circle_surface(diameter: int = PARTICLE_SPRITE_SIZE) -> SDL_Surface:
+    surface = SDL_CreateRGBSurfaceWithFormat(0, diameter, diameter, 32, SDL_PIXELFORMAT_RGBA32)
+    surf = surface.contents
+    buffer = (c_uint8 * (surf.h * surf.pitch)).from_address(surf.pixels)
+    pixels = np.ctypeslib.as_array(buffer).reshape(surf.h, surf.pitch)[:, :diameter * 4].reshape(diameter, diameter, 4)
+    centers = np.arange(diameter) + 0.5 - diameter / 2
+    distance = np.hypot(centers[np.newaxis, :], centers[:, np.newaxis]) / (diameter / 2)
+    pixels[..., :3] = 255
+    pixels[..., 3] = (np.clip(1.5 - distance * 1.5, 0, 1) * 255).astype(np.uint8)
+    return surface
+
+
+class ParticleSystem:
+    def __init__(self, atlas: SpriteAtlas, sprite: str, capacity: int = 1024) -> None:
+        self.sprite = sprite
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.velocity_x = np.zeros(capacity, dtype=np.float32)
+        self.velocity_y = np.zeros(capacity, dtype=np.float32)
+        self.sizes = np.zeros(capacity, dtype=np.float32)
+        self.ages = np.zeros(capacity, dtype=np.float32)
+        self.colors = np.zeros((capacity, 4), dtype=np.uint8)
+        self.scratch = np.zeros(capacity, dtype=np.float32)
+        self.start = 0
+        self.end = 0
+        self.batch = SpriteBatch(atlas, capacity)
+        random = np.random.default_rng(0)
+        angles = np.linspace(0, 2 * np.pi, BURST_SIZE, endpoint=False) + random.uniform(-0.1, 0.1, BURST_SIZE)
+        speeds = BURST_SPEED * random.uniform(0.4, 1.0, BURST_SIZE)
+        self.burst_velocity_x = (np.cos(angles) * speeds).astype(np.float32)
+        self.burst_velocity_y = (np.sin(angles) * speeds).astype(np.float32)
+        self.burst_sizes = np.resize(np.array(PARTICLE_SIZES, dtype=np.float32), BURST_SIZE)
+        self.burst_offsets = self.burst_sizes / 2
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def clear(self) -> None:
+        self.start = 0
+        self.end = 0
+
+    def compact(self, incoming: int) -> None:
+        overflow = len(self) + incoming - self.capacity
+        if overflow > 0:
+            self.start += overflow
+        count = len(self)
+        for values in (self.x, self.y, self.velocity_x, self.velocity_y, self.sizes, self.ages, self.colors):
+            values[:count] = values[self.start:self.end]
+        self.start = 0
+        self.end = count
+
+    def burst(self, x: float, y: float, color: tuple[int, int, int]) -> None:
+        if self.end + BURST_SIZE > self.capacity:
+            self.compact(BURST_SIZE)
+        spawned = slice(self.end, self.end + BURST_SIZE)
+        np.subtract(x, self.burst_offsets, out=self.x[spawned])
+        np.subtract(y, self.burst_offsets, out=self.y[spawned])
+        self.velocity_x[spawned] = self.burst_velocity_x
+        self.velocity_y[spawned] = self.burst_velocity_y
+        self.sizes[spawned] = self.burst_sizes
+        self.ages[spawned] = 0
+        self.colors[spawned, :3] = color
+        self.end += BURST_SIZE
+
+    def update(self, delta_time: float) -> None:
+        alive = slice(self.start, self.end)
+        scratch = self.scratch[:len(self)]
+        np.multiply(self.velocity_x[alive], delta_time, out=scratch)
+        self.x[alive] += scratch
+        np.multiply(self.velocity_y[alive], delta_time, out=scratch)
+        self.y[alive] += scratch
+        self.ages[alive] += delta_time
+        while self.start < self.end and self.ages[self.start] >= PARTICLE_LIFETIME:
+            self.start += 1
+        if self.start == self.end:
+            self.clear()
+
+    def draw(self, renderer: SDL_Renderer, offset_x: float, offset_y: float) -> None:
+        alive = slice(self.start, self.end)
+        scratch = self.scratch[:len(self)]
+        np.multiply(self.ages[alive], -255 / PARTICLE_LIFETIME, out=scratch)
+        scratch += 255
+        self.colors[alive, 3] = scratch
+        self.batch.clear()
+        self.batch.translate(offset_x, offset_y)
+        self.batch.add_quads(
+            self.sprite, self.x[alive], self.y[alive], self.sizes[alive], self.sizes[alive], self.colors[alive]
+        )
+        self.batch.draw(renderer)
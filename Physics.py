@@ -0,0 +1,18 @@
+PHYSICS_VERSION = 2
+
+GRAVITY = 1440
+RUN_SPEED = 336
+JUMP_MOMENTUM = -600
+JUMP_PAD_MOMENTUM = -700
+DASH_MULTIPLIER = 4
+DASH_DURATION = 0.1
+DASH_COOLDOWN = 0.12
+ORB_COOLDOWN = 3
+RESPAWN_TIMEOUT = 0.25
+PLAYER_SIZE = 24
+
+LEFT = 1
+RIGHT = 2
+JUMP = 4
+DASH = 8
+JUMP_RELEASE = 16
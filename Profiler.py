@@ -0,0 +1,102 @@
+from pathlib import Path
+from time import perf_counter_ns, strftime
+import numpy as np
+
+
+PROFILES_FOLDER = Path.cwd() / "profiles"
+
+EVENTS = 0
+UPDATE = 1
+DRAW = 2
+OVERLAY = 3
+PRESENT = 4
+WAIT = 5
+SPECIALS = 6
+VERTICAL = 7
+HORIZONTAL = 8
+DEADLY_WALLS = 9
+
+PHASES = ("events", "update", "draw", "overlay", "present", "wait", "specials", "vertical", "horizontal", "deadly walls")
+FRAME_PHASES = (EVENTS, UPDATE, DRAW, OVERLAY, PRESENT, WAIT)
+
+
+class Profiler:
+    def __init__(self, capacity: int = 600) -> None:
+        self.enabled = False
+        self.capacity = capacity
+        self.samples = np.zeros((capacity, len(PHASES)))
+        self.frame_times = np.zeros(capacity)
+        self.latencies = np.full(capacity, np.nan)
+        self.latency = np.nan
+        self.frames = 0
+        self.current = [0] * len(PHASES)
+        self.frame_start = 0
+
+    def start(self) -> int:
+        if not self.enabled:
+            return 0
+        return perf_counter_ns()
+
+    def stop(self, phase: int, started: int) -> None:
+        if self.enabled:
+            self.current[phase] += perf_counter_ns() - started
+
+    def record_latency(self, milliseconds: int) -> None:
+        if self.enabled and (np.isnan(self.latency) or milliseconds > self.latency):
+            self.latency = milliseconds
+
+    def end_frame(self) -> None:
+        if not self.enabled:
+            return
+        now = perf_counter_ns()
+        if self.frame_start:
+            row = self.frames % self.capacity
+            self.samples[row] = self.current
+            self.samples[row] /= 1e6
+            self.frame_times[row] = (now - self.frame_start) / 1e6
+            self.latencies[row] = self.latency
+            self.frames += 1
+        self.current = [0] * len(PHASES)
+        self.latency = np.nan
+        self.frame_start = now
+
+    def toggle(self) -> None:
+        self.enabled = not self.enabled
+        self.current = [0] * len(PHASES)
+        self.frame_start = 0
+
+    def recent(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        count = min(self.frames, self.capacity)
+        order = (np.arange(self.frames - count, self.frames)) % self.capacity
+        return self.frame_times[order], self.samples[order], self.latencies[order]
+
+    def percentiles(self, quantiles: tuple[int, ...] = (50, 95, 99)) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        frame_times, samples, latencies = self.recent()
+        latencies = latencies[~np.isnan(latencies)]
+        if len(latencies) == 0:
+            latencies = np.zeros(1)
+        if len(frame_times) == 0:
+            return np.zeros(len(quantiles)), np.zeros((len(quantiles), len(PHASES))), np.zeros(len(quantiles))
+        return (
+            np.percentile(frame_times, quantiles),
+            np.percentile(samples, quantiles, axis=0),
+            np.percentile(latencies, quantiles)
+        )
+
+    def dump_csv(self, path: Path | None = None) -> Path:
+        if path is None:
+            path = PROFILES_FOLDER / f"frames-{strftime('%Y%m%d-%H%M%S')}.csv"
+        frame_times, samples, latencies = self.recent()
+        first = self.frames - len(frame_times)
+        table = np.column_stack((np.arange(first, self.frames), frame_times, samples, latencies))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = ",".join(("frame", "frame ms") + tuple(f"{name} ms" for name in PHASES) + ("input latency ms",))
+        np.savetxt(path, table, fmt=["%d"] + ["%.4f"] * (table.shape[1] - 1), delimiter=",", header=header, comments="")
+        return path
+
+
+_profiler = Profiler()
+
+
+def profiler() -> Profiler:
+    return _profiler
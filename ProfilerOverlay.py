@@ -0,0 +1,82 @@
+from ctypes import byref, c_int
+import numpy as np
+from sdl2 import *
+from sdl2.sdlttf import *
+from Assets import assets
+from Profiler import Profiler, PHASES, FRAME_PHASES
+from useful import render_utf8_solid_as_texture
+
+
+WHITE = SDL_Color(255, 255, 255, SDL_ALPHA_OPAQUE)
+PHASE_COLORS = (
+    (90, 160, 255), (80, 220, 120), (255, 200, 60), (200, 120, 255), (255, 90, 90), (110, 110, 110)
+)
+GRAPH_HEIGHT = 240
+PIXELS_PER_MS = 6
+TEXT_REFRESH_FRAMES = 30
+LINE_HEIGHT = 22
+VALUES_OFFSET = 170
+
+
+class ProfilerOverlay:
+    def __init__(self, renderer: SDL_Renderer, profiler: Profiler) -> None:
+        self.profiler = profiler
+        self.font = assets().font("TinyUnicode.ttf", 24)
+        self.rects = (SDL_Rect * profiler.capacity)()
+        self.rect_values = np.frombuffer(self.rects, dtype=np.int32).reshape(profiler.capacity, 4)
+        self.lines: list[tuple[SDL_Texture, SDL_Texture]] = []
+        self.lines_frame = -TEXT_REFRESH_FRAMES
+
+    def refresh_text(self, renderer: SDL_Renderer) -> None:
+        self.destroy_text()
+        frame, phases, latency = self.profiler.percentiles()
+        rows = [("frame", frame)] + [(name, phases[:, i]) for i, name in enumerate(PHASES)] + [("input latency", latency)]
+        for name, (p50, p95, p99) in rows:
+            values = f"p50 {p50:.2f}   p95 {p95:.2f}   p99 {p99:.2f} ms"
+            self.lines.append((
+                render_utf8_solid_as_texture(renderer, self.font, name.encode(), WHITE),
+                render_utf8_solid_as_texture(renderer, self.font, values.encode(), WHITE)
+            ))
+        self.lines_frame = self.profiler.frames
+
+    def draw(self, renderer: SDL_Renderer) -> None:
+        if self.profiler.frames - self.lines_frame >= TEXT_REFRESH_FRAMES:
+            self.refresh_text(renderer)
+        _, samples, _ = self.profiler.recent()
+        count = len(samples)
+        left, bottom = 16, 16 + GRAPH_HEIGHT
+        background = SDL_Rect(8, 8, self.profiler.capacity + 16, GRAPH_HEIGHT + 24 + LINE_HEIGHT * len(self.lines))
+        SDL_SetRenderDrawColor(renderer, 0, 0, 0, 192)
+        SDL_RenderFillRect(renderer, byref(background))
+        base = np.zeros(count)
+        values = self.rect_values[:count]
+        values[:, 0] = left + np.arange(count)
+        values[:, 2] = 1
+        for phase, color in zip(FRAME_PHASES, PHASE_COLORS):
+            top = np.minimum(base + samples[:, phase] * PIXELS_PER_MS, GRAPH_HEIGHT)
+            values[:, 1] = bottom - np.ceil(top)
+            values[:, 3] = np.ceil(top) - np.floor(base)
+            SDL_SetRenderDrawColor(renderer, *color, SDL_ALPHA_OPAQUE)
+            SDL_RenderFillRects(renderer, self.rects, count)
+            base = top
+        SDL_SetRenderDrawColor(renderer, 255, 255, 255, 96)
+        for budget in (1000 / 120, 1000 / 60):
+            y = bottom - int(budget * PIXELS_PER_MS)
+            SDL_RenderDrawLine(renderer, left, y, left + self.profiler.capacity, y)
+        y = bottom + 8
+        for line in self.lines:
+            for x, texture in zip((left, left + VALUES_OFFSET), line):
+                w, h = c_int(0), c_int(0)
+                SDL_QueryTexture(texture, None, None, byref(w), byref(h))
+                SDL_RenderCopy(renderer, texture, None, SDL_Rect(x, y, w, h))
+            y += LINE_HEIGHT
+
+    def destroy_text(self) -> None:
+        for name, values in self.lines:
+            SDL_DestroyTexture(name)
+            SDL_DestroyTexture(values)
+        self.lines = []
+
+    def destroy(self) -> None:
+        self.destroy_text()
+        assets().release(self.font)
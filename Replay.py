@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from os import replace, getpid
+from pathlib import Path
+from struct import Struct, error as StructError
+from time import strftime
+from zlib import crc32
+import numpy as np
+from CollisionGrid import CollisionGrid
+from MapCache import load_room, room_count
+from Physics import PHYSICS_VERSION
+from RoomSpecials import RoomSpecials
+from Simulation import Simulation
+
+
+REPLAYS_FOLDER = Path.cwd() / "replays"
+
+MAGIC = b"NPRP"
+VERSION = 1
+HEADER = Struct("<4sHHH?BIIII")
+EVENT = np.dtype([("tick", "<u4"), ("action", "u1"), ("pressed", "u1")])
+
+
+def chain_hash(digest: int, state_hash: int) -> int:
+    return crc32(state_hash.to_bytes(4, "little"), digest)
+
+
+@dataclass
+class Replay:
+    map_name: str
+    tick_rate: int
+    full_jump_release: bool
+    physics_version: int = PHYSICS_VERSION
+    events: list[tuple[int, int, bool]] = field(default_factory=list)
+    ticks: int = 0
+    deaths: int = 0
+    digest: int = 0
+
+    def record(self, tick: int, action: int, pressed: bool) -> None:
+        self.events.append((tick, action, pressed))
+
+    def record_tick(self, simulation: Simulation) -> None:
+        self.ticks = simulation.tick
+        self.deaths = simulation.player_deaths
+        self.digest = chain_hash(self.digest, simulation.state_hash())
+
+    def play(self, simulation: Simulation, cursor: int) -> int:
+        while cursor < len(self.events) and self.events[cursor][0] <= simulation.tick:
+            _, action, pressed = self.events[cursor]
+            if pressed:
+                simulation.press(action)
+            else:
+                simulation.release(action)
+            cursor += 1
+        return cursor
+
+    def check_version(self) -> None:
+        if self.physics_version != PHYSICS_VERSION:
+            raise ValueError(
+                f"Replay was recorded with physics version {self.physics_version}, this build runs {PHYSICS_VERSION}"
+            )
+
+    def save(self, path: Path | None = None) -> Path:
+        if path is None:
+            path = REPLAYS_FOLDER / f"{self.map_name}-{strftime('%Y%m%d-%H%M%S')}.npr"
+        name = self.map_name.encode()
+        events = np.array(self.events, dtype=EVENT)
+        header = HEADER.pack(
+            MAGIC, VERSION, self.physics_version, self.tick_rate, self.full_jump_release, len(name),
+            self.ticks, self.deaths, self.digest, len(events)
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(f".{getpid()}.tmp")
+        with open(temporary, "wb") as file:
+            file.write(header)
+            file.write(name)
+            file.write(events.tobytes())
+        replace(temporary, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "Replay":
+        data = Path(path).read_bytes()
+        try:
+            magic, version, physics_version, tick_rate, full_jump_release, name_length, ticks, deaths, digest, count = (
+                HEADER.unpack_from(data)
+            )
+        except StructError:
+            raise ValueError(f"{path} is truncated") from None
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a replay file this build can read")
+        name = data[HEADER.size:HEADER.size + name_length].decode()
+        if name in ("", ".", "..") or "/" in name or "\\" in name:
+            raise ValueError(f"{path} names an invalid map {name!r}")
+        events = np.frombuffer(data, dtype=EVENT, count=count, offset=HEADER.size + name_length)
+        return cls(
+            name, tick_rate, full_jump_release, physics_version,
+            [(int(tick), int(action), bool(pressed)) for tick, action, pressed in events.tolist()],
+            ticks, deaths, digest
+        )
+
+
+@dataclass
+class ReplayResult:
+    map_name: str
+    finished: bool
+    ticks: int
+    time: float
+    deaths: int
+    digest: int
+    verified: bool
+    hashes: np.ndarray
+    error: str = ""
+
+
+def load_map(map_name: str) -> tuple[list[CollisionGrid], list[RoomSpecials]]:
+    walls, specials = [], []
+    rooms = room_count(map_name)
+    if rooms == 0:
+        raise ValueError(f"Map {map_name} has no rooms")
+    for room in range(1, rooms + 1):
+        room_walls, room_specials = load_room(map_name, room)
+        walls.append(room_walls)
+        specials.append(room_specials)
+    return walls, specials
+
+
+def run_replay(replay: Replay) -> ReplayResult:
+    replay.check_version()
+    walls, specials = load_map(replay.map_name)
+    simulation = Simulation(walls, specials, replay.full_jump_release)
+    delta_time = 1 / replay.tick_rate
+    hashes = []
+    digest = 0
+    cursor = 0
+    while not simulation.finished and simulation.tick < replay.ticks:
+        cursor = replay.play(simulation, cursor)
+        simulation.step(delta_time)
+        state_hash = simulation.state_hash()
+        hashes.append(state_hash)
+        digest = chain_hash(digest, state_hash)
+    verified = (
+        simulation.finished and simulation.tick == replay.ticks
+        and simulation.player_deaths == replay.deaths and digest == replay.digest
+    )
+    return ReplayResult(
+        replay.map_name, simulation.finished, simulation.tick, simulation.tick * delta_time,
+        simulation.player_deaths, digest, verified, np.array(hashes, dtype=np.uint32)
+    )
+
+
+def verify_replay(path: Path) -> ReplayResult:
+    try:
+        return run_replay(Replay.load(path))
+    except (OSError, ValueError) as error:
+        return ReplayResult("", False, 0, 0.0, 0, 0, False, np.zeros(0, dtype=np.uint32), str(error))
+
+
+def verify_replays(paths: list[Path], workers: int | None = None) -> bool:
+    all_verified = True
+    with ProcessPoolExecutor(workers) as pool:
+        for path, result in zip(paths, pool.map(verify_replay, paths)):
+            if result.error:
+                print(f"{path}: FAILED {result.error}")
+                all_verified = False
+                continue
+            status = "ok" if result.verified else "MISMATCH"
+            print(f"{path}: {status} {result.map_name} {result.time:.3f}s {result.deaths} deaths {result.digest:08x}")
+            all_verified = all_verified and result.verified
+    return all_verified
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Re-simulate recorded runs without a window and check their results")
+    parser.add_argument("replays", nargs="+", type=Path)
+    parser.add_argument("--workers", type=int, default=None)
+    arguments = parser.parse_args()
+    raise SystemExit(0 if verify_replays(arguments.replays, arguments.workers) else 1)
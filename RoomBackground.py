@@ -0,0 +1,79 @@
+from ctypes import byref
+from math import ceil
+from sdl2 import *
+
+
+CHUNK_SIZE = 960
+UPLOAD_MARGIN = CHUNK_SIZE // 2
+EVICT_MARGIN = CHUNK_SIZE
+
+
+class RoomBackground:
+    def __init__(self, surface: SDL_Surface) -> None:
+        self.width = surface.contents.w
+        self.height = surface.contents.h
+        self.columns = ceil(self.width / CHUNK_SIZE)
+        self.rows = ceil(self.height / CHUNK_SIZE)
+        self.rects: list[SDL_Rect] = []
+        self.surfaces: list[SDL_Surface] = []
+        SDL_SetSurfaceBlendMode(surface, SDL_BLENDMODE_NONE)
+        for row in range(self.rows):
+            for column in range(self.columns):
+                x, y = column * CHUNK_SIZE, row * CHUNK_SIZE
+                rect = SDL_Rect(x, y, min(CHUNK_SIZE, self.width - x), min(CHUNK_SIZE, self.height - y))
+                chunk = SDL_CreateRGBSurfaceWithFormat(0, rect.w, rect.h, 32, SDL_PIXELFORMAT_ARGB8888)
+                SDL_BlitSurface(surface, byref(rect), chunk, None)
+                self.rects.append(rect)
+                self.surfaces.append(chunk)
+        self.textures: list[SDL_Texture | None] = [None] * len(self.surfaces)
+
+    def chunks_in(self, view: tuple[int, int, int, int], margin: int = 0) -> list[int]:
+        x, y, width, height = view
+        first_column = max((x - margin) // CHUNK_SIZE, 0)
+        last_column = min((x + width + margin - 1) // CHUNK_SIZE, self.columns - 1)
+        first_row = max((y - margin) // CHUNK_SIZE, 0)
+        last_row = min((y + height + margin - 1) // CHUNK_SIZE, self.rows - 1)
+        return [
+            row * self.columns + column
+            for row in range(first_row, last_row + 1)
+            for column in range(first_column, last_column + 1)
+        ]
+
+    def is_ready(self, view: tuple[int, int, int, int]) -> bool:
+        return all(self.textures[chunk] is not None for chunk in self.chunks_in(view))
+
+    def upload(self, renderer: SDL_Renderer, views: list[tuple[int, int, int, int]], budget: int) -> int:
+        keep = set()
+        for view in views:
+            keep.update(self.chunks_in(view, EVICT_MARGIN))
+        for chunk, texture in enumerate(self.textures):
+            if texture is not None and chunk not in keep:
+                SDL_DestroyTexture(texture)
+                self.textures[chunk] = None
+        wanted = [chunk for view in views for chunk in self.chunks_in(view)]
+        wanted += [chunk for view in views for chunk in self.chunks_in(view, UPLOAD_MARGIN)]
+        for chunk in wanted:
+            if budget == 0:
+                break
+            if self.textures[chunk] is None:
+                self.textures[chunk] = SDL_CreateTextureFromSurface(renderer, self.surfaces[chunk])
+                budget -= 1
+        return budget
+
+    def draw(self, renderer: SDL_Renderer, view: tuple[int, int, int, int]) -> None:
+        x, y, _, _ = view
+        for chunk in self.chunks_in(view):
+            texture = self.textures[chunk]
+            if texture is None:
+                continue
+            rect = self.rects[chunk]
+            SDL_RenderCopy(renderer, texture, None, SDL_Rect(rect.x - x, rect.y - y, rect.w, rect.h))
+
+    def destroy(self) -> None:
+        for texture in self.textures:
+            if texture is not None:
+                SDL_DestroyTexture(texture)
+        for surface in self.surfaces:
+            SDL_FreeSurface(surface)
+        self.textures = []
+        self.surfaces = []
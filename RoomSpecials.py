@@ -0,0 +1,105 @@
+from array import array
+from math import floor, ceil
+import numpy as np
+from ColliderBox import ColliderBox
+from CollisionGrid import CELL_SIZE
+from SpecialObject import SpecialType, SPECIAL_COLORS, RESPAWN_POINT
+
+
+class RoomSpecials:
+    def __init__(self, table: np.ndarray) -> None:
+        cells = table.tolist()
+        kinds = [SPECIAL_COLORS[color] for color, _, _ in cells]
+        order = sorted(range(len(cells)), key=lambda i: (kinds[i].index, i))
+        count = len(order)
+        self.types: list[SpecialType] = [kinds[i] for i in order]
+        self.order = array("I", order)
+        self.x = array("i", [cells[i][1] * CELL_SIZE for i in order])
+        self.y = array("i", [cells[i][2] * CELL_SIZE for i in order])
+        self.left = array("d", [0.0]) * count
+        self.top = array("d", [0.0]) * count
+        self.right = array("d", [0.0]) * count
+        self.bottom = array("d", [0.0]) * count
+        self.timers = array("d", [0.0]) * count
+        self.active = array("b", [0]) * count
+        self.cooling: set[int] = set()
+        self.groups: dict[str, range] = {}
+        self.buckets: dict[tuple[int, int], list[int]] = {}
+        for i, kind in enumerate(self.types):
+            group = self.groups.get(kind.name)
+            self.groups[kind.name] = range(group.start if group else i, i + 1)
+            if kind.collider is None:
+                continue
+            dx, dy, width, height = kind.collider
+            self.left[i], self.top[i] = self.x[i] + dx, self.y[i] + dy
+            self.right[i], self.bottom[i] = self.left[i] + width, self.top[i] + height
+            for column in range(floor(self.left[i] / CELL_SIZE), ceil(self.right[i] / CELL_SIZE)):
+                for row in range(floor(self.top[i] / CELL_SIZE), ceil(self.bottom[i] / CELL_SIZE)):
+                    self.buckets.setdefault((column, row), []).append(i)
+        spawns = self.indices(RESPAWN_POINT)
+        self.spawn = spawns.start if spawns else -1
+        self.checkpoint = -1
+        self.pristine = self.snapshot()
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def indices(self, name: str) -> range:
+        return self.groups.get(name, range(0))
+
+    def boxes(self, name: str) -> np.ndarray:
+        group = self.indices(name)
+        left = np.array(self.left[group.start:group.stop])
+        top = np.array(self.top[group.start:group.stop])
+        right = np.array(self.right[group.start:group.stop])
+        bottom = np.array(self.bottom[group.start:group.stop])
+        return np.column_stack((left, top, right - left, bottom - top)).reshape(-1, 4)
+
+    def touching(self, collider: ColliderBox) -> list[int]:
+        x, y = collider.x, collider.y
+        x1, y1 = x + collider.width, y + collider.height
+        found = []
+        for column in range(floor(x / CELL_SIZE), ceil(x1 / CELL_SIZE)):
+            for row in range(floor(y / CELL_SIZE), ceil(y1 / CELL_SIZE)):
+                for i in self.buckets.get((column, row), ()):
+                    if (self.left[i] < x1 and self.right[i] > x and self.top[i] < y1 and self.bottom[i] > y
+                            and i not in found):
+                        found.append(i)
+        if len(found) > 1:
+            found.sort(key=self.order.__getitem__)
+        return found
+
+    def snapshot(self) -> tuple[array, array, frozenset[int], int]:
+        return array("d", self.timers), array("b", self.active), frozenset(self.cooling), self.checkpoint
+
+    def restore(self, snapshot: tuple[array, array, frozenset[int], int]) -> None:
+        timers, active, cooling, checkpoint = snapshot
+        self.timers[:] = timers
+        self.active[:] = active
+        self.cooling = set(cooling)
+        self.checkpoint = checkpoint
+
+    def reset(self) -> None:
+        self.restore(self.pristine)
+
+    def start_cooldown(self, i: int, duration: float) -> None:
+        self.timers[i] = duration
+        self.cooling.add(i)
+
+    def advance_timers(self, delta_time: float) -> bool:
+        if not self.cooling:
+            return False
+        timers = self.timers
+        expired = []
+        for i in self.cooling:
+            timers[i] -= delta_time
+            if timers[i] <= 0:
+                expired.append(i)
+        self.cooling.difference_update(expired)
+        return len(expired) > 0
+
+    def activate_checkpoint(self, i: int) -> None:
+        if self.checkpoint >= 0:
+            self.active[self.checkpoint] = 0
+        self.active[i] = 1
+        self.checkpoint = i
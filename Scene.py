@@ -14,13 +14,22 @@ class Scene(ABC):
         pass
 
     @abstractmethod
-    def draw(self, window: SDL_Window, renderer: SDL_Renderer) -> None:
+    def draw(self, window: SDL_Window, renderer: SDL_Renderer, interpolation: float) -> None:
         pass
 
     @abstractmethod
     def on_mouse_button_down(self, position: tuple[int, int]) -> None:
         pass
 
+    def on_mouse_motion(self, position: tuple[int, int]) -> None:
+        pass
+
+    def is_idle(self) -> bool:
+        return False
+
+    def invalidate(self) -> None:
+        pass
+
     @abstractmethod
     def on_mouse_button_up(self, position: tuple[int, int]) -> None:
         pass
@@ -1,47 +1,84 @@
+from collections.abc import Callable
 from typing import Any
 from sdl2 import *
 from Scene import Scene
+from Profiler import profiler, UPDATE, DRAW
 
 
 class SceneManager:
     def __init__(self) -> None:
+        self.factories: dict[str, Callable[[], Scene]] = {}
         self.scenes: dict[str, Scene] = {}
+        self.evict_on_leave: set[str] = set()
         self.active_scene: str = ""
         self.should_quit = False
         self.data: Any = None
+        self.profiler = profiler()
 
     def set_active_scene(self, name: str) -> None:
-        if not name in self.scenes:
+        if not name in self.factories:
             raise ValueError(f"Scene named \"{name}\" does not exist")
+        previous = self.active_scene
+        self.load_scene(name)
         self.active_scene = name
+        if previous != name and previous in self.evict_on_leave:
+            self.unload_scene(previous)
 
-    def add_scene(self, scene: Scene, name: str) -> None:
-        if name in self.scenes:
+    def switch_scene(self, name: str, data: Any) -> None:
+        self.set_active_scene(name)
+        self.scenes[name].on_enter(data)
+
+    def load_scene(self, name: str) -> Scene:
+        if name not in self.scenes:
+            self.scenes[name] = self.factories[name]()
+        return self.scenes[name]
+
+    def unload_scene(self, name: str) -> None:
+        scene = self.scenes.pop(name, None)
+        if scene is not None:
+            scene.quit()
+
+    def add_scene(self, factory: Callable[[], Scene], name: str, evict_on_leave: bool = False) -> None:
+        if name in self.factories:
             raise ValueError(f"Scene named {name} already exists")
-        self.scenes[name] = scene
+        self.factories[name] = factory
+        if evict_on_leave:
+            self.evict_on_leave.add(name)
         if self.active_scene == "":
-            self.active_scene = name
+            self.set_active_scene(name)
 
-    def add_scenes(self, scenes: dict[str, Scene]) -> None:
-        for name, scene in scenes.items():
-            self.add_scene(scene, name)
+    def add_scenes(self, factories: dict[str, Callable[[], Scene]], evict_on_leave: set[str] = frozenset()) -> None:
+        for name, factory in factories.items():
+            self.add_scene(factory, name, name in evict_on_leave)
 
     def update(self, delta_time: float) -> None:
+        started = self.profiler.start()
         ret = self.scenes[self.active_scene].update(self.data_setter, delta_time)
+        self.profiler.stop(UPDATE, started)
         if ret is not None:
             if ret == "SceneManager Quit":
                 self.should_quit = True
             else:
-                self.set_active_scene(ret)
-                self.scenes[self.active_scene].on_enter(self.data)
+                self.switch_scene(ret, self.data)
                 self.data = None
 
-    def draw(self, window: SDL_Window, renderer: SDL_Renderer) -> None:
-        self.scenes[self.active_scene].draw(window, renderer)
+    def draw(self, window: SDL_Window, renderer: SDL_Renderer, interpolation: float) -> None:
+        started = self.profiler.start()
+        self.scenes[self.active_scene].draw(window, renderer, interpolation)
+        self.profiler.stop(DRAW, started)
+
+    def is_idle(self) -> bool:
+        return self.scenes[self.active_scene].is_idle()
+
+    def invalidate(self) -> None:
+        self.scenes[self.active_scene].invalidate()
 
     def on_mouse_button_down(self, position: tuple[int, int]) -> None:
         self.scenes[self.active_scene].on_mouse_button_down(position)
 
+    def on_mouse_motion(self, position: tuple[int, int]) -> None:
+        self.scenes[self.active_scene].on_mouse_motion(position)
+
     def on_mouse_button_up(self, position: tuple[int, int]) -> None:
         self.scenes[self.active_scene].on_mouse_button_up(position)
 
@@ -55,5 +92,5 @@ class SceneManager:
         self.data = data
 
     def quit(self) -> None:
-        for scene in self.scenes.values():
-            scene.quit()
+        for name in list(self.scenes):
+            self.unload_scene(name)
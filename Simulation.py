@@ -0,0 +1,251 @@
+from math import ceil
+from struct import Struct
+from zlib import crc32
+from ColliderBox import ColliderBox
+from CollisionGrid import CollisionGrid, DEADLY, CELL_SIZE
+from RoomSpecials import RoomSpecials
+from Physics import *
+from Profiler import profiler, SPECIALS, VERTICAL, HORIZONTAL, DEADLY_WALLS
+
+
+STATE = Struct("<4d3d5?2I")
+
+
+class Simulation:
+    def __init__(self, walls: list[CollisionGrid | None], specials: list[RoomSpecials | None],
+                 full_jump_release: bool) -> None:
+        self.map_rooms_walls = walls
+        self.map_rooms_specials = specials
+        self.room_count = len(walls)
+        self.full_jump_release = full_jump_release
+        self.player_collider = ColliderBox(0, 0, PLAYER_SIZE, PLAYER_SIZE)
+        self.previous_position: tuple[float, float] = (0, 0)
+        self.current_room = 0
+        self.tick = 0
+        self.finished = False
+        self.needs_reset = True
+        self.special_objects_dirty = True
+        self.momentum_x = 0.0
+        self.momentum_y = 0.0
+        self.should_jump = False
+        self.can_jump = False
+        self.grabbing_wall = False
+        self.dash_timer = 0.0
+        self.can_dash = False
+        self.should_dash = False
+        self.dash_momentum = 0.0
+        self.dash_timeout = 0.0
+        self.bursts: list[tuple[int, int, bool]] = []
+        self.touching: list[int] = []
+        self.previously_touching: list[int] = []
+        self.player_deaths = 0
+        self.has_active_checkpoint = False
+        self.update_timeout = 0.0
+        self.moving_right = False
+        self.moving_left = False
+        self.profiler = profiler()
+
+    def press(self, action: int) -> None:
+        if action == JUMP:
+            self.should_jump = True
+        elif action == DASH:
+            self.should_dash = True
+        elif action == RIGHT:
+            self.moving_right = True
+        elif action == LEFT:
+            self.moving_left = True
+
+    def release(self, action: int) -> None:
+        if action == JUMP and self.momentum_y < 0:
+            if self.full_jump_release:
+                self.momentum_y = 0
+            else:
+                self.momentum_y /= 3
+        elif action == LEFT:
+            self.moving_left = False
+        elif action == RIGHT:
+            self.moving_right = False
+
+    def state_hash(self) -> int:
+        return crc32(STATE.pack(
+            self.player_collider.x, self.player_collider.y, self.momentum_x, self.momentum_y,
+            self.dash_timer, self.dash_timeout, self.update_timeout,
+            self.can_jump, self.can_dash, self.grabbing_wall, self.has_active_checkpoint, self.finished,
+            self.current_room, self.player_deaths
+        ))
+
+    def player_reset(self) -> None:
+        self.momentum_y = 0.0
+        self.momentum_x = 0.0
+        self.can_jump = False
+        self.can_dash = False
+        self.dash_timer = 0.0
+        self.update_timeout = RESPAWN_TIMEOUT
+        room = self.map_rooms_specials[self.current_room]
+        respawn = room.checkpoint if self.has_active_checkpoint else room.spawn
+        if respawn >= 0:
+            self.player_collider.x = room.x[respawn]
+            self.player_collider.y = room.y[respawn]
+        self.previous_position = self.player_collider.x, self.player_collider.y
+        self.touching = []
+        self.previously_touching = []
+
+    def emit_burst(self, x: int, y: int, is_death: bool) -> None:
+        self.bursts.append((x, y, is_death))
+
+    def player_die(self) -> None:
+        self.emit_burst(int(self.player_collider.x) + 12, int(self.player_collider.y) + 12, True)
+        self.player_reset()
+        self.player_deaths += 1
+
+    def handle_timeout(self, delta_time: float) -> bool:
+        if self.update_timeout > 0:
+            self.update_timeout -= delta_time
+            return True
+        return False
+
+    def handle_player_out_of_bounds(self) -> None:
+        walls = self.map_rooms_walls[self.current_room]
+        if (self.player_collider.x < 0
+            or self.player_collider.y < 0
+            or self.player_collider.x > (walls.width + 1) * CELL_SIZE
+            or self.player_collider.y > (walls.height + 1) * CELL_SIZE):
+            self.player_die()
+
+    def handle_jump_and_dash(self, delta_time: float) -> None:
+        if self.should_jump:
+            if self.can_jump:
+                self.player_collider.y -= 1
+                self.momentum_y = JUMP_MOMENTUM
+                self.can_jump = False
+            self.should_jump = False
+        self.dash_timer -= delta_time
+        self.dash_timeout -= delta_time
+        if self.should_dash:
+            if self.can_dash and self.dash_timeout <= 0 and self.momentum_x != 0:
+                self.momentum_y = min(self.momentum_y, 0)
+                self.can_dash = False
+                self.dash_timer = DASH_DURATION
+                self.player_collider.y = int(self.player_collider.y + 1)
+                self.dash_momentum = self.momentum_x * DASH_MULTIPLIER
+                self.dash_timeout = DASH_COOLDOWN
+            self.should_dash = False
+
+    def push_out_vertically(self, wall: ColliderBox) -> None:
+        if self.momentum_y > 0:
+            self.player_collider.y -= ceil(self.player_collider.y + self.player_collider.height - wall.y)
+        else:
+            self.player_collider.y += ceil(wall.y + wall.height - self.player_collider.y)
+
+    def push_out_horizontally(self, wall: ColliderBox) -> None:
+        if self.momentum_x < 0:
+            self.player_collider.x += ceil(wall.x + wall.width - self.player_collider.x)
+        else:
+            self.player_collider.x -= ceil(self.player_collider.x + self.player_collider.width - wall.x)
+
+    def handle_vertical_movement(self, delta_time: float) -> None:
+        distance = 0.0
+        if self.dash_timer <= 0:
+            self.momentum_y += GRAVITY * delta_time
+            distance = self.momentum_y * delta_time
+        if self.grabbing_wall:
+            if self.momentum_y > 0:
+                distance -= self.momentum_y * delta_time
+            if self.momentum_y > 0:
+                self.momentum_y = 0
+        walls = self.map_rooms_walls[self.current_room]
+        _, hit = walls.sweep(self.player_collider, 0, distance)
+        self.player_collider.y += distance
+        if hit is not None:
+            self.push_out_vertically(hit)
+        colliding = hit is not None
+        for wall in walls.walls_near(self.player_collider):
+            if wall.is_colliding(self.player_collider):
+                colliding = True
+                self.push_out_vertically(wall)
+        if colliding:
+            self.dash_timer = 0
+            if self.momentum_y > 0:
+                self.can_jump = True
+                self.can_dash = True
+            self.momentum_y = 0.0
+
+    def handle_horizontal_movement(self, delta_time: float) -> None:
+        self.grabbing_wall = False
+        if self.dash_timer > 0:
+            self.momentum_x = self.dash_momentum
+        distance = self.momentum_x * delta_time
+        walls = self.map_rooms_walls[self.current_room]
+        _, hit = walls.sweep(self.player_collider, distance, 0)
+        self.player_collider.x += distance
+        if hit is not None:
+            self.push_out_horizontally(hit)
+        colliding = hit is not None
+        for wall in walls.walls_near(self.player_collider):
+            if wall.is_colliding(self.player_collider):
+                colliding = True
+                self.push_out_horizontally(wall)
+        if colliding:
+            self.can_jump = True
+            self.can_dash = True
+            self.grabbing_wall = True
+            self.momentum_x = 0
+
+    def finish_room(self) -> None:
+        self.current_room += 1
+        self.has_active_checkpoint = False
+        if self.current_room == self.room_count:
+            self.finished = True
+        else:
+            self.needs_reset = True
+
+    def handle_deadly_walls(self) -> None:
+        if self.map_rooms_walls[self.current_room].is_touching(self.player_collider, DEADLY):
+            self.player_die()
+
+    def handle_player_input(self):
+        self.momentum_x = 0.0
+        if self.moving_left:
+            self.momentum_x -= RUN_SPEED
+        if self.moving_right:
+            self.momentum_x += RUN_SPEED
+
+    def step(self, delta_time: float) -> None:
+        self.tick += 1
+        if self.needs_reset:
+            self.needs_reset = False
+            self.player_reset()
+        self.previous_position = self.player_collider.x, self.player_collider.y
+        self.bursts.clear()
+        in_timeout = self.handle_timeout(delta_time)
+        if in_timeout:
+            return
+        self.handle_player_input()
+        profiler = self.profiler
+        started = profiler.start()
+        left_room = self.handle_special_objects(delta_time)
+        profiler.stop(SPECIALS, started)
+        if left_room:
+            return
+        started = profiler.start()
+        self.handle_vertical_movement(delta_time)
+        profiler.stop(VERTICAL, started)
+        started = profiler.start()
+        self.handle_horizontal_movement(delta_time)
+        profiler.stop(HORIZONTAL, started)
+        started = profiler.start()
+        self.handle_player_out_of_bounds()
+        self.handle_deadly_walls()
+        profiler.stop(DEADLY_WALLS, started)
+        self.handle_jump_and_dash(delta_time)
+
+    def handle_special_objects(self, delta_time: float) -> bool:
+        room = self.map_rooms_specials[self.current_room]
+        if room.advance_timers(delta_time):
+            self.special_objects_dirty = True
+        self.previously_touching = self.touching
+        self.touching = room.touching(self.player_collider)
+        for i in self.touching:
+            if room.types[i].kernel(self, room, i):
+                return True
+        return False
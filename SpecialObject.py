@@ -1,44 +1,99 @@
-from abc import ABC
+from collections.abc import Callable
 from dataclasses import dataclass
-from ColliderBox import ColliderBox
+from typing import Any
+from Physics import JUMP_PAD_MOMENTUM, ORB_COOLDOWN
 
 
-class SpecialObject(ABC):
-    pass
+RESPAWN_POINT = "respawn point"
+JUMP_PAD = "jump pad"
+JUMP_ORB = "jump orb"
+DASH_ORB = "dash orb"
+ROOM_FINISH = "room finish"
+CHECKPOINT = "checkpoint"
 
 
-@dataclass
-class RespawnPoint(SpecialObject):
-    position: tuple[int, int]
+def pack_color(red: int, green: int, blue: int) -> int:
+    return red << 16 | green << 8 | blue
 
 
-@dataclass
-class JumpPad(SpecialObject):
-    position: tuple[int, int]
-    collider: ColliderBox
+@dataclass(frozen=True)
+class SpecialType:
+    index: int
+    name: str
+    color: int
+    collider: tuple[int, int, int, int] | None
+    kernel: Callable[[Any, Any, int], bool] | None
+    draw: Callable[[Any, int], str | None] | None
+    baked_sprite: str | None
 
 
-@dataclass
-class JumpOrb(SpecialObject):
-    position: tuple[int, int]
-    collider: ColliderBox
-    inactive_timer: float = 0.0
+SPECIAL_TYPES: dict[str, SpecialType] = {}
+SPECIAL_COLORS: dict[int, SpecialType] = {}
 
 
-@dataclass
-class DashOrb(SpecialObject):
-    position: tuple[int, int]
-    collider: ColliderBox
-    inactive_timer: float = 0.0
+def register(name: str, color: int, collider: tuple[int, int, int, int] | None = None,
+             kernel: Callable[[Any, Any, int], bool] | None = None,
+             draw: Callable[[Any, int], str | None] | None = None,
+             baked_sprite: str | None = None) -> SpecialType:
+    if name in SPECIAL_TYPES:
+        raise ValueError(f"Special object type \"{name}\" is already registered")
+    if color in SPECIAL_COLORS:
+        raise ValueError(f"Color #{color:06x} is already used by \"{SPECIAL_COLORS[color].name}\"")
+    special_type = SpecialType(len(SPECIAL_TYPES), name, color, collider, kernel, draw, baked_sprite)
+    SPECIAL_TYPES[name] = special_type
+    SPECIAL_COLORS[color] = special_type
+    return special_type
 
 
-@dataclass
-class RoomFinish(SpecialObject):
-    collider: ColliderBox
+def touch_jump_pad(simulation: Any, room: Any, i: int) -> bool:
+    simulation.momentum_y = JUMP_PAD_MOMENTUM
+    simulation.can_jump = True
+    simulation.can_dash = True
+    if i not in simulation.previously_touching:
+        simulation.emit_burst(room.x[i] + 12, room.y[i] + 12, False)
+    return False
 
 
-@dataclass
-class Checkpoint(SpecialObject):
-    position: tuple[int, int]
-    collider: ColliderBox
-    active: bool = False
+def touch_jump_orb(simulation: Any, room: Any, i: int) -> bool:
+    if not simulation.can_jump and room.timers[i] <= 0:
+        simulation.can_jump = True
+        room.start_cooldown(i, ORB_COOLDOWN)
+        simulation.special_objects_dirty = True
+    return False
+
+
+def touch_dash_orb(simulation: Any, room: Any, i: int) -> bool:
+    if not simulation.can_dash and room.timers[i] <= 0:
+        simulation.can_dash = True
+        room.start_cooldown(i, ORB_COOLDOWN)
+        simulation.special_objects_dirty = True
+    return False
+
+
+def touch_checkpoint(simulation: Any, room: Any, i: int) -> bool:
+    if not room.active[i]:
+        simulation.special_objects_dirty = True
+        simulation.has_active_checkpoint = True
+        room.activate_checkpoint(i)
+    return False
+
+
+def touch_room_finish(simulation: Any, room: Any, i: int) -> bool:
+    simulation.finish_room()
+    return True
+
+
+def orb_sprite(sprite: str) -> Callable[[Any, int], str | None]:
+    return lambda room, i: sprite if room.timers[i] <= 0 else None
+
+
+def checkpoint_sprite(room: Any, i: int) -> str:
+    return "checkpoint_on" if room.active[i] else "checkpoint_off"
+
+
+register(RESPAWN_POINT, pack_color(255, 255, 0))
+register(JUMP_PAD, pack_color(0, 255, 0), (0, 18, 24, 6), touch_jump_pad, baked_sprite="jump_pad.png")
+register(JUMP_ORB, pack_color(0, 0, 255), (4, 4, 16, 16), touch_jump_orb, orb_sprite("jump_orb"))
+register(DASH_ORB, pack_color(255, 0, 255), (4, 4, 16, 16), touch_dash_orb, orb_sprite("dash_orb"))
+register(ROOM_FINISH, pack_color(0, 255, 255), (0, 0, 24, 24), touch_room_finish, baked_sprite="room_finish.png")
+register(CHECKPOINT, pack_color(0, 127, 127), (6, 6, 14, 17), touch_checkpoint, checkpoint_sprite)
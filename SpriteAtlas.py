@@ -0,0 +1,36 @@
+from ctypes import byref
+from sdl2 import *
+from Assets import assets
+
+
+class SpriteAtlas:
+    def __init__(self, renderer: SDL_Renderer, sprites: dict[str, str | SDL_Surface]) -> None:
+        surfaces = {}
+        for name, sprite in sprites.items():
+            if not isinstance(sprite, str):
+                surfaces[name] = SDL_ConvertSurfaceFormat(sprite, SDL_PIXELFORMAT_RGBA32, 0)
+                continue
+            raw = assets().surface(sprite)
+            surfaces[name] = SDL_ConvertSurfaceFormat(raw, SDL_PIXELFORMAT_RGBA32, 0)
+            assets().release(raw)
+        self.width = sum(surf.contents.w for surf in surfaces.values())
+        self.height = max((surf.contents.h for surf in surfaces.values()), default=0)
+        atlas = SDL_CreateRGBSurfaceWithFormat(0, max(self.width, 1), max(self.height, 1), 32, SDL_PIXELFORMAT_RGBA32)
+        self.regions: dict[str, SDL_Rect] = {}
+        x = 0
+        for name, surf in surfaces.items():
+            region = SDL_Rect(x, 0, surf.contents.w, surf.contents.h)
+            SDL_SetSurfaceBlendMode(surf, SDL_BLENDMODE_NONE)
+            SDL_BlitSurface(surf, None, atlas, byref(region))
+            SDL_FreeSurface(surf)
+            self.regions[name] = SDL_Rect(x, 0, region.w, region.h)
+            x += region.w
+        self.texture = SDL_CreateTextureFromSurface(renderer, atlas)
+        SDL_SetTextureBlendMode(self.texture, SDL_BLENDMODE_BLEND)
+        SDL_FreeSurface(atlas)
+
+    def draw(self, renderer: SDL_Renderer, name: str, dst: SDL_Rect) -> None:
+        SDL_RenderCopy(renderer, self.texture, byref(self.regions[name]), byref(dst))
+
+    def destroy(self) -> None:
+        SDL_DestroyTexture(self.texture)
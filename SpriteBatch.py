@@ -0,0 +1,100 @@
+from ctypes import c_int, sizeof
+import numpy as np
+from sdl2 import *
+from SpriteAtlas import SpriteAtlas
+
+
+class SpriteBatch:
+    def __init__(self, atlas: SpriteAtlas, capacity: int = 64) -> None:
+        self.atlas = atlas
+        self.count = 0
+        self.capacity = 0
+        self.vertices = (SDL_Vertex * 0)()
+        self.indices = (c_int * 0)()
+        self.positions = np.zeros((0, 4, 2), dtype=np.float32)
+        self.colors = np.zeros((0, 4, 4), dtype=np.uint8)
+        self.tex_coords = np.zeros((0, 4, 2), dtype=np.float32)
+        self.offset = 0, 0
+        self.reserve(capacity)
+
+    def reserve(self, capacity: int) -> None:
+        if capacity <= self.capacity:
+            return
+        vertices = (SDL_Vertex * (capacity * 4))()
+        indices = (c_int * (capacity * 6))()
+        for i in range(self.count * 4):
+            vertices[i] = self.vertices[i]
+        for quad in range(capacity):
+            first = quad * 4
+            indices[quad * 6:quad * 6 + 6] = [first, first + 1, first + 2, first + 2, first + 3, first]
+        self.vertices = vertices
+        self.indices = indices
+        self.capacity = capacity
+        strides = (sizeof(SDL_Vertex) * 4, sizeof(SDL_Vertex))
+        self.positions = np.ndarray((capacity, 4, 2), dtype=np.float32, buffer=vertices, strides=strides + (4,))
+        self.colors = np.ndarray((capacity, 4, 4), dtype=np.uint8, buffer=vertices, offset=8, strides=strides + (1,))
+        self.tex_coords = np.ndarray((capacity, 4, 2), dtype=np.float32, buffer=vertices, offset=12, strides=strides + (4,))
+
+    def clear(self) -> None:
+        self.count = 0
+        self.offset = 0, 0
+
+    def translate(self, x: float, y: float) -> None:
+        if (x, y) == self.offset:
+            return
+        self.positions[:self.count] += (x - self.offset[0], y - self.offset[1])
+        self.offset = x, y
+
+    def add(self, name: str, x: float, y: float, width: float, height: float,
+            color: tuple[int, int, int, int] = (255, 255, 255, 255)) -> None:
+        if self.count == self.capacity:
+            self.reserve(max(1, self.capacity * 2))
+        region = self.atlas.regions[name]
+        u0 = region.x / self.atlas.width
+        v0 = region.y / self.atlas.height
+        u1 = (region.x + region.w) / self.atlas.width
+        v1 = (region.y + region.h) / self.atlas.height
+        first = self.count * 4
+        x += self.offset[0]
+        y += self.offset[1]
+        for i, (vx, vy, u, v) in enumerate((
+            (x, y, u0, v0),
+            (x + width, y, u1, v0),
+            (x + width, y + height, u1, v1),
+            (x, y + height, u0, v1)
+        )):
+            vertex = self.vertices[first + i]
+            vertex.position.x = vx
+            vertex.position.y = vy
+            vertex.color.r, vertex.color.g, vertex.color.b, vertex.color.a = color
+            vertex.tex_coord.x = u
+            vertex.tex_coord.y = v
+        self.count += 1
+
+    def add_quads(self, name: str, x: np.ndarray, y: np.ndarray, width: float | np.ndarray, height: float | np.ndarray,
+                  colors: np.ndarray) -> None:
+        first, last = self.count, self.count + len(x)
+        if last > self.capacity:
+            self.reserve(max(last, self.capacity * 2))
+        region = self.atlas.regions[name]
+        positions = self.positions[first:last]
+        np.add(x, self.offset[0], out=positions[:, 0, 0])
+        np.add(y, self.offset[1], out=positions[:, 0, 1])
+        np.add(positions[:, 0, 0], width, out=positions[:, 1, 0])
+        np.add(positions[:, 0, 1], height, out=positions[:, 2, 1])
+        positions[:, 1, 1] = positions[:, 0, 1]
+        positions[:, 2, 0] = positions[:, 1, 0]
+        positions[:, 3, 0] = positions[:, 0, 0]
+        positions[:, 3, 1] = positions[:, 2, 1]
+        self.colors[first:last] = colors[:, np.newaxis]
+        u0 = region.x / self.atlas.width
+        v0 = region.y / self.atlas.height
+        u1 = (region.x + region.w) / self.atlas.width
+        v1 = (region.y + region.h) / self.atlas.height
+        self.tex_coords[first:last] = ((u0, v0), (u1, v0), (u1, v1), (u0, v1))
+        self.count = last
+
+    def draw(self, renderer: SDL_Renderer) -> None:
+        if self.count == 0:
+            return
+        SDL_RenderGeometry(renderer, self.atlas.texture, self.vertices, self.count * 4, self.indices, self.count * 6)
@@ -0,0 +1,32 @@
+from collections.abc import Callable
+from sdl2 import *
+from Button import Button
+from CommonScreenBuffer import begin, finish, mouse_position, retains_frame
+
+
+class UI:
+    def __init__(self, buttons: list[Button]) -> None:
+        self.buttons = buttons
+        self.dirty = True
+
+    def invalidate(self) -> None:
+        self.dirty = True
+
+    def is_idle(self) -> bool:
+        return not self.dirty
+
+    def on_mouse_motion(self, position: tuple[int, int]) -> None:
+        for button in self.buttons:
+            if button.set_mouse_position(position):
+                self.dirty = True
+
+    def refresh(self) -> None:
+        self.on_mouse_motion(mouse_position())
+        self.dirty = True
+
+    def present(self, renderer: SDL_Renderer, compose: Callable[[SDL_Renderer], None]) -> None:
+        if self.dirty or not retains_frame():
+            begin(renderer)
+            compose(renderer)
+            self.dirty = False
+        finish(renderer)
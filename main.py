@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+from argparse import ArgumentParser
 from sdl2 import *
 from sdl2.sdlimage import *
 from sdl2.sdlttf import *
@@ -6,10 +7,15 @@ from Game import Game
 
 
 def main() -> None:
-    SDL_Init(SDL_INIT_VIDEO)
+    parser = ArgumentParser()
+    parser.add_argument("--replay", help="play back a recorded run")
+    arguments = parser.parse_args()
+    SDL_Init(SDL_INIT_VIDEO | SDL_INIT_GAMECONTROLLER)
     IMG_Init(IMG_INIT_PNG)
     TTF_Init()
     game = Game()
+    if arguments.replay is not None:
+        game.play_replay(arguments.replay)
     game.run()
     game.quit()
     TTF_Quit()
@@ -1,4 +1,5 @@
-from ctypes import cast, POINTER, c_uint8
+from ctypes import c_uint8
+import numpy as np
 from sdl2 import *
 from sdl2.sdlimage import *
 from sdl2.sdlttf import *
@@ -14,11 +15,11 @@ def load_image_as_texture(file: bytes, renderer: SDL_Renderer) -> SDL_Texture:
     return texture
 
 
-def getpixel(surface: SDL_Surface, x: int, y: int):
-    pos = y * 240 + x * 3
-    pixels = cast(surface.contents.pixels, POINTER(c_uint8))
-    red, green, blue = pixels[pos:pos+3]
-    return red, green, blue
+def rgb24_pixels(surface: SDL_Surface) -> np.ndarray:
+    surf = surface.contents
+    buffer = (c_uint8 * (surf.h * surf.pitch)).from_address(surf.pixels)
+    rows = np.ctypeslib.as_array(buffer).reshape(surf.h, surf.pitch)
+    return rows[:, :surf.w * 3].reshape(surf.h, surf.w, 3)
 
 def render_utf8_solid_as_texture(renderer: SDL_Renderer, font: TTF_Font, text: bytes, color: SDL_Color) -> SDL_Texture:
     surf = TTF_RenderUTF8_Solid(font, text, color)